@@ -1,9 +1,5 @@
 """Elk Area."""
-from collections import namedtuple
-from collections import deque
 import logging
-import time
-import traceback
 
 from ..Const import *
 from ..Node import Node
@@ -183,7 +179,7 @@ class Area(Node):
                 self._last_user_num = state['last_user_num']
             elif state_key == 'last_user_at':
                 self._last_user_at = state['last_user_at']
-            elif state_key == 'last_user_at':
+            elif state_key == 'last_user_name':
                 self._last_user_name = state['last_user_name']
             elif state_key == 'last_disarmed_at':
                 self._last_disarmed_at = state['last_disarmed_at']
@@ -412,22 +408,26 @@ class Area(Node):
         U[8]: Array of 8 area arm up state
         A[8]: Array of 8 area alarm state
         """
-        status = event.data_dehex()[self._index]
-        arm_up = event.data_dehex()[8+self._index]
+        data = event.data_dehex()
         alarm = event.data_dehex(True)[16+self._index]
+        self._update_arming_status(data[self._index], data[8+self._index],
+                                   alarm, event.time)
+
+    def _update_arming_status(self, status, arm_up, alarm, updated_at):
+        """Set state decoded from EVENT_ARMING_STATUS_REPORT."""
         if (self._status == status) and (self._arm_up == arm_up) and (self._alarm == alarm):
             return
         self._status = status
         # Hopefully it never takes more than a second to get from
         # EVENT_USER_CODE_ENTERED to EVENT_ARMING_STATUS_REPORT
-        if (event.time - self._last_user_at) < 1.0:
+        if (updated_at - self._last_user_at) < 1.0:
             if self._status == self.STATUS_DISARMED:
-                self._last_disarmed_at = event.time
+                self._last_disarmed_at = updated_at
             else:
-                self._last_armed_at = event.time
+                self._last_armed_at = updated_at
         self._arm_up = arm_up
         self._alarm = alarm
-        self._updated_at = event.time
+        self._updated_at = updated_at
         self._callback()
 
     def unpack_event_entry_exit_timer(self, event):
@@ -442,7 +442,7 @@ class Area(Node):
         """
         # Determine if this is Entrance or Exit timer update
         is_entrance = None
-        if event.data[0] == '1':
+        if event.data_str[0] == '1':
             is_entrance = True
         else:
             is_entrance = False
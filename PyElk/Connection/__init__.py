@@ -1,7 +1,6 @@
 from collections import deque
 import logging
 import time
-import traceback
 import threading
 import serial
 import serial.threaded
@@ -13,6 +12,16 @@ _LOGGER = logging.getLogger(__name__)
 class SerialInputHandler(serial.threaded.LineReader):
     """LaneHandler implementation for serial.threaded."""
 
+    # The Elk protocol is plain ASCII
+    ENCODING = 'ascii'
+
+    _pyelk = None
+    _connection = None
+
+    def set_connection(self, connection):
+        """Sets the Connection this handler belongs to."""
+        self._connection = connection
+
     def set_pyelk(self, pyelk):
         """Sets the pyelk instance to use."""
         self._pyelk = pyelk
@@ -34,9 +43,15 @@ class SerialInputHandler(serial.threaded.LineReader):
     def connection_lost(self, exc):
         """Connection was lost."""
         _LOGGER.debug('Lost connection')
-        self._pyelk._connection._connection_output.stop()
+        connection = self._connection
+        if connection is not None and connection._connection_output is not None:
+            connection._connection_output.stop()
         if exc:
-            traceback.print_exc(exc)
+            _LOGGER.error('Connection lost: %s', exc)
+        if (connection is None) or connection._closing or (self._pyelk is None):
+            # Closed on purpose (or never fully set up), don't reconnect
+            return
+        self._pyelk._schedule_reconnect()
 
 class SerialOutputHandler(object):
     """SerialOutputHandler handles outputting events to serial.threaded via deque."""
@@ -63,6 +78,11 @@ class SerialOutputHandler(object):
         """Stop thread."""
         self._stopping = True
 
+    def close(self):
+        """Stop thread, waking it up so that it can exit."""
+        self.stop()
+        self.resume()
+
     def pause(self):
         """Pause thread."""
         self._event.clear()
@@ -73,43 +93,75 @@ class SerialOutputHandler(object):
 
     def run(self):
         """Thread that handles outputting queued events to the Elk."""
-        pending = False
         self._event.wait()
         while not self._stopping:
             if len(self._queue) == 0:
                 self._event.wait()
                 self._event.clear()
-            _LOGGER.debug('woke up send queue : ' + str(len(self._queue)))
-            for event in list(self._queue):
-                # Only send events that aren't in the future
-                if event.time <= time.time():
+                if self._stopping:
+                    break
+            _LOGGER.debug('woke up send queue : %d', len(self._queue))
+            now = time.time()
+            # Rotate through the queue once, sending due events and
+            # putting the rest back in order
+            for _ in range(len(self._queue)):
+                # Until the event is back on the queue (or done with), an
+                # expected reply could not cancel its retries
+                with self._pyelk._outgoing_lock:
+                    try:
+                        event = self._queue.popleft()
+                    except IndexError:
+                        # Queue was cleared from under us
+                        break
+                    # Only send events that aren't in the future
+                    if event.time > now:
+                        self._queue.append(event)
+                        continue
                     self._pyelk.elk_event_send_actual(event)
-                    self._queue.remove(event)
                     # If retries is greater than 0 and we have an expect
                     if (event.retries > 0) and (len(event.expect) > 0):
                         event.retries = event.retries - 1
                         event.time = time.time() + event.retry_delay
                         # Queue the retry
                         self._queue.append(event)
-                    # Sleep after sending to avoid flooding
-                    time.sleep(self._interval)
-            # Sleep if more events not yet able to be sent
-            if len(self._queue) > 0:
+                # Sleep after sending to avoid flooding
                 time.sleep(self._interval)
+                now = time.time()
+            # Wait until the next event is due, or more events are queued
+            pending = list(self._queue)
+            if len(pending) > 0:
+                delay = min([event.time for event in pending]) - time.time()
+                self._event.wait(max(delay, self._interval))
+                self._event.clear()
 
 class Connection():
     def __init__(self):
         self._elkrp_connected = False
+        self._connection = None
+        self._connection_transport = None
         self._connection_protocol = None
         self._connection_thread = None
         self._connection_output = None
+        # Set by close(), so the input handler can tell a deliberate
+        # close from a lost connection
+        self._closing = False
 
     def __del__(self):
         """Shutdown communications."""
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def close(self):
+        """Stop the output thread and close the serial connection."""
+        self._closing = True
+        if self._connection_output is not None:
+            self._connection_output.close()
+            self._connection_output = None
         if self._connection_thread is not None:
-            self._connection_output.stop()
-            #self._connection_output.close()
             self._connection_thread.close()
+            self._connection_thread = None
 
     @property
     def connected(self):
@@ -139,6 +191,7 @@ class Connection():
         self._connection_thread = serial.threaded.ReaderThread(self._connection, SerialInputHandler)
         self._connection_thread.start()
         self._connection_transport, self._connection_protocol = self._connection_thread.connect()
+        self._connection_protocol.set_connection(self)
         self._connection_protocol.set_pyelk(pyelk)
         self._connection_output = SerialOutputHandler(ratelimit)
         self._connection_output.set_pyelk(pyelk)
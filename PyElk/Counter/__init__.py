@@ -1,9 +1,5 @@
 """Elk Counter."""
-from collections import namedtuple
-from collections import deque
 import logging
-import time
-import traceback
 
 from ..Const import *
 from ..Node import Node
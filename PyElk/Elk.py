@@ -1,10 +1,9 @@
 """Implementation of the main PyElk class, which is the interface used to
 initiate and control communications with the Elk device.
 """
-from collections import deque
+from collections import defaultdict, deque
 import logging
 import time
-import traceback
 import json
 import threading
 
@@ -14,7 +13,7 @@ from .Const import *
 from .Node import Node
 from .Area import Area
 from .Counter import Counter
-from .Event import Event
+from .Event import Event, EventPool
 from .Keypad import Keypad
 from .Output import Output
 from .Setting import Setting
@@ -29,7 +28,7 @@ _LOGGER = logging.getLogger(__name__)
 
 # Events automatically handled under normal circumstances
 # by elk_process_event
-EVENT_LIST_AUTO_PROCESS = [
+EVENT_LIST_AUTO_PROCESS = frozenset([
     Event.EVENT_ALARM_ZONE_REPORT,
     Event.EVENT_ALARM_MEMORY,
     Event.EVENT_ARMING_STATUS_REPORT,
@@ -57,14 +56,14 @@ EVENT_LIST_AUTO_PROCESS = [
     Event.EVENT_ZONE_PARTITION_REPORT,
     Event.EVENT_ZONE_STATUS_REPORT,
     Event.EVENT_ZONE_UPDATE,
-    ]
+    ])
 
 # Events specifically NOT handled automatically by elk_process_event
 # while rescan is in progress
-EVENT_LIST_RESCAN_BLACKLIST = [
+EVENT_LIST_RESCAN_BLACKLIST = frozenset([
     Event.EVENT_ZONE_DEFINITION_REPLY,
     Event.EVENT_ZONE_STATUS_REPORT,
-    ]
+    ])
 
 class Scanner(object):
     """Scanner class handles rescanning of Elk system on a separate thread."""
@@ -106,13 +105,24 @@ class Scanner(object):
         self._stopping = False
         self._state = self.STATE_SCAN_IDLE
         self._event = threading.Event()
-        thread = threading.Thread(target=self.run, args=())
-        thread.start()
+        self._thread = threading.Thread(target=self.run, args=())
+        self._thread.start()
 
     def stop(self):
         """Stop thread."""
         self._stopping = True
 
+    def close(self):
+        """Stop thread, waking it up so that it can exit, and wait for it."""
+        self.stop()
+        self.resume()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def is_alive(self):
+        """Return True if the thread is still running."""
+        return self._thread.is_alive()
+
     def pause(self):
         """Pause thread."""
         self._event.clear()
@@ -203,6 +213,8 @@ class Elk(Node):
        or device name of the serial device connected to the Elk panel,
        ex: 'socket://192.168.12.34:2101' or '/dev/ttyUSB0'
     |  config['ratelimit'] [optional]: rate limit for outgoing events (default 10/s)
+    |  config['synchronous'] [optional]: if True, process incoming events
+       on the serial reader thread instead of a thread of our own (default False)
     |  log: [optional] Log file class from logging module
     """
 
@@ -234,12 +246,60 @@ class Elk(Node):
         self._state_fastload_file = 'PyElk-fastload.json'
         self._events = None
         self._reconnect_thread = None
+        # Set by stop() to cut short the reconnect thread's backoff
+        self._reconnect_wakeup = threading.Event()
+        self._stopping = False
         self._config = config
         self._queue_incoming_elk_events = deque(maxlen=1000)
+        # Events waiting for elk_event_scan, indexed by event type
+        self._incoming_by_type = defaultdict(lambda: deque(maxlen=1000))
+        self._incoming_condition = threading.Condition()
+        # Incoming events that we process ourselves are reused afterwards
+        self._event_pool = EventPool()
+        # Set when there are incoming events for the consumer thread
+        self._incoming_ready = threading.Event()
+        self._consumer_thread = None
+        # (method, args) due to be run by the event processing, see _call_later
+        self._deferred_calls = deque()
+        # Handlers for events in EVENT_LIST_AUTO_PROCESS
+        self._event_handlers = {
+            Event.EVENT_ALARM_MEMORY : self._handle_alarm_memory,
+            Event.EVENT_ALARM_ZONE_REPORT : self._handle_alarm_zone_report,
+            Event.EVENT_ARMING_STATUS_REPORT : self._handle_arming_status_report,
+            Event.EVENT_COUNTER_REPLY : self._handle_counter_reply,
+            Event.EVENT_ENTRY_EXIT_TIMER : self._handle_entry_exit_timer,
+            Event.EVENT_ETHERNET_TEST : self._handle_ethernet_test,
+            Event.EVENT_INSTALLER_ELKRP : self._handle_installer_elkrp,
+            Event.EVENT_INSTALLER_EXIT : self._handle_installer_exit,
+            Event.EVENT_KEYPAD_AREA_REPLY : self._handle_keypad_area_reply,
+            Event.EVENT_KEYPAD_STATUS_REPORT : self._handle_keypad_status_report,
+            Event.EVENT_OMNISTAT_DATA_REPLY : self._handle_omnistat_data_reply,
+            Event.EVENT_OUTPUT_STATUS_REPORT : self._handle_output_status_report,
+            Event.EVENT_OUTPUT_UPDATE : self._handle_output_update,
+            Event.EVENT_PLC_CHANGE_UPDATE : self._handle_plc_change_update,
+            Event.EVENT_PLC_STATUS_REPLY : self._handle_plc_status_reply,
+            Event.EVENT_RTC_REPLY : self._handle_rtc_reply,
+            Event.EVENT_TASK_UPDATE : self._handle_task_update,
+            Event.EVENT_TEMP_REQUEST_REPLY : self._handle_temp_request_reply,
+            Event.EVENT_THERMOSTAT_DATA_REPLY : self._handle_thermostat_data_reply,
+            Event.EVENT_TROUBLE_STATUS_REPLY : self._handle_trouble_status_reply,
+            Event.EVENT_USER_CODE_ENTERED : self._handle_user_code_entered,
+            Event.EVENT_VALUE_READ_REPLY : self._handle_value_read_reply,
+            Event.EVENT_VERSION_REPLY : self._handle_version_reply,
+            Event.EVENT_ZONE_DEFINITION_REPLY : self._handle_zone_definition_reply,
+            Event.EVENT_ZONE_PARTITION_REPORT : self._handle_zone_partition_report,
+            Event.EVENT_ZONE_STATUS_REPORT : self._handle_zone_status_report,
+            Event.EVENT_ZONE_UPDATE : self._handle_zone_update,
+            }
         self._queue_outgoing_elk_events = None
+        # Held by the output thread while it has an event off the outgoing
+        # deque, so retry cancellation always finds the event on it
+        self._outgoing_lock = threading.Lock()
         #self._queue_exported_events = deque(maxlen=1000)
         self._rescan_thread = Scanner(self)
         self._update_in_progress = False
+        self._update_pending = False
+        self._update_lock = threading.Lock()
         self._elk_versions = None
         self._save_needed = False
         self.AREAS = []
@@ -259,38 +319,21 @@ class Elk(Node):
         else:
             self.log = log
 
-        # Using 0..N+1 and putting None in 0 so we aren't constantly converting between 0
-        # and 1 based as often...
-        # May change back to 0..N at a later date
-
-        max_range = {
-            'zone': ZONE_MAX_COUNT,
-            'output' : OUTPUT_MAX_COUNT,
-            'area' : AREA_MAX_COUNT,
-            'keypad' : KEYPAD_MAX_COUNT,
-            'thermostat' : THERMOSTAT_MAX_COUNT,
-            'user' : USER_MAX_COUNT,
-            'x10' : X10_MAX_COUNT,
-            'task' : TASK_MAX_COUNT,
-            'counter' : COUNTER_MAX_COUNT,
-            'setting' : SETTING_MAX_COUNT,
-            }
-
-        range_order = {
-            0 : 'zone',
-            1 : 'output',
-            2 : 'area',
-            3 : 'keypad',
-            4 : 'thermostat',
-            5 : 'x10',
-            6 : 'task',
-            7 : 'user',
-            8 : 'counter',
-            9 : 'setting',
-            }
-
-        for device_class_num in range_order:
-            device_class = range_order[device_class_num]
+        # Device class config name, type, count and the attribute holding them
+        device_classes = (
+            ('zone', Zone, ZONE_MAX_COUNT, 'ZONES'),
+            ('output', Output, OUTPUT_MAX_COUNT, 'OUTPUTS'),
+            ('area', Area, AREA_MAX_COUNT, 'AREAS'),
+            ('keypad', Keypad, KEYPAD_MAX_COUNT, 'KEYPADS'),
+            ('thermostat', Thermostat, THERMOSTAT_MAX_COUNT, 'THERMOSTATS'),
+            ('x10', X10, X10_MAX_COUNT, 'X10'),
+            ('task', Task, TASK_MAX_COUNT, 'TASKS'),
+            ('user', User, USER_MAX_COUNT, 'USERS'),
+            ('counter', Counter, COUNTER_MAX_COUNT, 'COUNTERS'),
+            ('setting', Setting, SETTING_MAX_COUNT, 'SETTINGS'),
+            )
+
+        for device_class, device_type, max_range, device_attr in device_classes:
             include_range = None
             exclude_range = None
             if device_class in self._config:
@@ -299,61 +342,19 @@ class Elk(Node):
                 if 'exclude' in self._config[device_class]:
                     exclude_range = self._list_from_ranges(self._config[device_class]['exclude'])
             if include_range is None:
-                include_range = range(0, max_range[device_class])
+                include_range = range(0, max_range)
             if exclude_range is None:
                 exclude_range = []
-            self.log.debug('PyElk config - ' + device_class + ' include range: %s', include_range)
-            self.log.debug('PyElk config - ' + device_class + ' exclude range: %s', exclude_range)
-            for device_num in range(0, max_range[device_class]):
-                # Create device
-                if device_class == 'zone':
-                    device = Zone(self, device_num)
-                elif device_class == 'output':
-                    device = Output(self, device_num)
-                elif device_class == 'area':
-                    device = Area(self, device_num)
-                elif device_class == 'keypad':
-                    device = Keypad(self, device_num)
-                elif device_class == 'thermostat':
-                    device = Thermostat(self, device_num)
-                elif device_class == 'x10':
-                    device = X10(self, device_num)
-                elif device_class == 'task':
-                    device = Task(self, device_num)
-                elif device_class == 'user':
-                    device = User(self, device_num)
-                elif device_class == 'counter':
-                    device = Counter(self, device_num)
-                elif device_class == 'setting':
-                    device = Setting(self, device_num)
-                # perform inclusion/exclusion
-                if device_num in include_range:
-                    self.log.debug(device_class + ' ' + str(device_num) + ' included')
+            self.log.debug('PyElk config - %s include range: %s', device_class, include_range)
+            self.log.debug('PyElk config - %s exclude range: %s', device_class, exclude_range)
+            # Create devices
+            devices = [device_type(self, device_num) for device_num in range(0, max_range)]
+            # Perform inclusion/exclusion
+            included = set(include_range).difference(exclude_range)
+            for device_num, device in enumerate(devices):
+                if device_num in included:
                     device.included = True
-                if device_num in exclude_range:
-                    self.log.debug(device_class + ' ' + str(device_num) + ' excluded')
-                    device.included = False
-                # Append device
-                if device_class == 'zone':
-                    self.ZONES.append(device)
-                elif device_class == 'output':
-                    self.OUTPUTS.append(device)
-                elif device_class == 'area':
-                    self.AREAS.append(device)
-                elif device_class == 'keypad':
-                    self.KEYPADS.append(device)
-                elif device_class == 'thermostat':
-                    self.THERMOSTATS.append(device)
-                elif device_class == 'x10':
-                    self.X10.append(device)
-                elif device_class == 'task':
-                    self.TASKS.append(device)
-                elif device_class == 'user':
-                    self.USERS.append(device)
-                elif device_class == 'counter':
-                    self.COUNTERS.append(device)
-                elif device_class == 'setting':
-                    self.SETTINGS.append(device)
+            setattr(self, device_attr, devices)
 
         # Perform fast load of previous state before returning
         if 'fastload' in self._config:
@@ -363,6 +364,13 @@ class Elk(Node):
         if self._state_fastload_enabled:
             self.state_load()
 
+        # Process incoming events on our own thread unless configured
+        # to process them synchronously on the serial reader thread
+        self._synchronous = False
+        if 'synchronous' in self._config:
+            self._synchronous = self._config['synchronous']
+        self._start_consumer()
+
     @property
     def connected(self):
         if self._status == self.STATE_RUNNING or self._status == self.STATE_PAUSED:
@@ -371,6 +379,22 @@ class Elk(Node):
 
     def connect(self):
         """Attempt to connect to Elk."""
+        self._stopping = False
+        self._reconnect_wakeup.clear()
+        # Stopped by an earlier stop()
+        if not self._rescan_thread.is_alive():
+            self._rescan_thread = Scanner(self)
+        self._start_consumer()
+        self._connect()
+
+    def _connect(self):
+        """Attempt to connect to Elk, without clearing a pending stop().
+
+        Used by the reconnect thread, so a stop() while it is running
+        isn't undone.
+        """
+        if self._connection is not None:
+            self._connection.close()
         try:
             ratelimit = 10
             if 'ratelimit' in self._config:
@@ -379,12 +403,9 @@ class Elk(Node):
             self._connection = Connection()
             self._connection.connect(self, self._config['host'], ratelimit)
 
-        except ValueError as exception_error:
+        except (ValueError, OSError) as exception_error:
             self._status = self.STATE_DISCONNECTED
-            try:
-                self.log.error(exception_error.message)
-            except AttributeError:
-                self.log.error(exception_error.args[0])
+            self.log.error('Unable to connect to Elk: %s', exception_error)
 
         if self._connection.connected:
             self._status = self.STATE_RUNNING
@@ -394,10 +415,60 @@ class Elk(Node):
 
     def stop(self):
         """Stop PyElk and disconnect from Elk."""
+        self._stopping = True
         self._status = self.STATE_DISCONNECTED
+        # Stop the rescan and reconnect threads before the connection
+        # goes away under them. Scans waiting on a reply give up.
+        with self._incoming_condition:
+            self._incoming_condition.notify_all()
+        self._rescan_thread.close()
+        self._reconnect_wakeup.set()
+        reconnect_thread = self._reconnect_thread
+        if (reconnect_thread is not None) and (
+                reconnect_thread is not threading.current_thread()):
+            reconnect_thread.join()
+        if self._connection is not None:
+            self._connection.close()
         self._connection = None
+        # Nothing more is coming in, wake the consumer thread so it exits
+        self._incoming_ready.set()
+        consumer_thread = self._consumer_thread
+        if (consumer_thread is not None) and (
+                consumer_thread is not threading.current_thread()):
+            consumer_thread.join()
         return
 
+    def _schedule_reconnect(self):
+        """Start the reconnect thread after the connection was lost."""
+        if self._stopping:
+            return
+        if self._reconnect_thread is not None and self._reconnect_thread.is_alive():
+            return
+        self._status = self.STATE_CONNECTING
+        self._reconnect_thread = threading.Thread(target=self._reconnect, args=())
+        self._reconnect_thread.daemon = True
+        self._reconnect_thread.start()
+
+    def _reconnect(self):
+        """Thread that reconnects to the Elk, backing off between attempts."""
+        delay = 1
+        while not self._stopping:
+            self._reconnect_wakeup.wait(delay)
+            if self._stopping:
+                return
+            _LOGGER.debug('Attempting reconnect')
+            self._connect()
+            if self._stopping:
+                # stop() was called while we were connecting
+                self.stop()
+                return
+            if self.connected:
+                _LOGGER.info('Reconnected to Elk')
+                # Panel state may have changed while we were disconnected
+                self.rescan()
+                return
+            delay = min(delay * 2, 30)
+
     def description_pretty(self, prefix='Elk M1G System'):
         """Elk system description."""
         return prefix
@@ -546,13 +617,33 @@ class Elk(Node):
 
         event: Event to send to Elk.
         """
-        event_str = event.to_string()
-        if self._connection._elkrp_connected:
-            _LOGGER.debug('Not queuing event due to active ElkRP: {}\n'.format(repr(event_str)))
+        connection = self._connection
+        connection_output = None
+        if connection is not None:
+            connection_output = connection._connection_output
+        if connection_output is None:
+            # Stopped, or waiting to reconnect
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug('Not queuing event while disconnected: %r', event.to_string())
+        elif connection._elkrp_connected:
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug('Not queuing event due to active ElkRP: %r', event.to_string())
         else:
-            _LOGGER.debug('Queuing: {}\n'.format(repr(event_str)))
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug('Queuing: %r', event.to_string())
             self._queue_outgoing_elk_events.append(event)
-            self._connection._connection_output.resume()
+            connection_output.resume()
+
+    def elk_event_request(self, event_type, data_str=''):
+        """Queue a simple request event to the Elk.
+
+        event_type: Event type to send.
+        data_str: Event data (default none).
+        """
+        event = Event()
+        event.type = event_type
+        event.data_str = data_str
+        self.elk_event_send(event)
 
     def elk_event_send_actual(self, event):
         """Send an Elk event to the Elk.
@@ -560,27 +651,48 @@ class Elk(Node):
         event: Event to send to Elk.
         """
         event_str = event.to_string()
-        _LOGGER.debug('Sending: {}\n'.format(repr(event_str)))
-        self._connection._connection_protocol.write_line(event_str)
+        connection = self._connection
+        if (connection is None) or (connection._connection_protocol is None):
+            _LOGGER.debug('Not sending while disconnected: %r', event_str)
+            return
+        _LOGGER.debug('Sending: %r', event_str)
+        connection._connection_protocol.write_line(event_str)
 
     def elk_event_enqueue(self, data):
         """Add event to the incoming event deque.
 
+        Events we process automatically go on the incoming event deque,
+        everything else (including events a rescan may be waiting for)
+        goes on the per-type index used by elk_event_scan.
+
         data: Event to place on the deque.
         """
-        event = Event()
+        event = self._event_pool.acquire()
         event.parse(data)
-        self._queue_incoming_elk_events.append(event)
-        # Remove any pending retries if this is an expected reply
-        for retry_event in list(self._queue_outgoing_elk_events):
-            if len(retry_event.expect) > 0:
-                match_len = len(retry_event.expect)
-                data_str = event.data_str[0:match_len]
-                if data_str.lower() == retry_event.expect.lower():
-                    self._queue_outgoing_elk_events.remove(retry_event)
-                    if not retry_event._retry_remove_all:
-                        break
-        self.update()
+        event_type = event.type
+        # Remove any pending retries if this is an expected reply. This
+        # must happen before the event is published, once queued the
+        # consumer may process and release (and so reset) it at any time
+        with self._outgoing_lock:
+            for retry_event in list(self._queue_outgoing_elk_events):
+                expect = retry_event.expect
+                if len(expect) > 0:
+                    data_str = event.data_str[0:len(expect)]
+                    if data_str.lower() == expect.lower():
+                        self._queue_outgoing_elk_events.remove(retry_event)
+                        if not retry_event._retry_remove_all:
+                            break
+        if (event_type in EVENT_LIST_AUTO_PROCESS) and not (
+                (event_type in EVENT_LIST_RESCAN_BLACKLIST) and self._rescan_in_progress):
+            self._queue_incoming_elk_events.append(event)
+        else:
+            with self._incoming_condition:
+                self._incoming_by_type[event_type].append(event)
+                self._incoming_condition.notify_all()
+        if self._synchronous:
+            self.update()
+        else:
+            self._incoming_ready.set()
 
     def elk_event_scan(self, event_type, data_match=None, timeout=10,
                        output_scan=False, reverse=False):
@@ -596,314 +708,425 @@ class Elk(Node):
         output_scan: If true, we scan the output queue instead
         reverse: If true, scan the queue in reverse order
         """
-        sleep_interval = 0.1
-        scan_queue = None
-        if output_scan:
-            scan_queue = self._queue_outgoing_elk_events
-        else:
-            scan_queue = self._queue_incoming_elk_events
-        reverse_flag = 1
-        if reverse:
-            reverse_flag = -1
-        endtime = time.time() + timeout
         if not isinstance(event_type, list):
             event_type = [event_type]
-        event = None
-        if (data_match is not None) and (not isinstance(data_match, list)):
-            data_match = [data_match]
-        first_try = True
-        while time.time() <= endtime:
-            # If not our first loop, sleep for a moment
-            if first_try:
-                first_try = False
+        if data_match is not None:
+            # Tuple so str.startswith can check all of them in one call
+            if isinstance(data_match, list):
+                data_match = tuple(data_match)
             else:
-                time.sleep(sleep_interval)
-            # Iterate the queue for events
-            for elem in list(scan_queue)[::reverse_flag]:
-                if elem.type in event_type:
-                    event = elem
-                    matched = True
-                    if data_match is not None:
-                        matched = False
-                        for match_str in data_match:
-                            match_len = len(match_str)
-                            data_str = event.data_str[0:match_len]
-                            if data_str == match_str:
-                                matched = True
-                    if matched:
-                        if not output_scan:
-                            self._queue_incoming_elk_events.remove(elem)
-                        return event
+                data_match = (data_match,)
+        if output_scan:
             # For output scan, no point waiting for the future
-            if output_scan:
-                return False
+            scan_queue = list(self._queue_outgoing_elk_events)
+            if reverse:
+                scan_queue.reverse()
+            for elem in scan_queue:
+                if (elem.type in event_type) and self._event_data_match(elem, data_match):
+                    return elem
+            return False
+        endtime = time.time() + timeout
+        with self._incoming_condition:
+            while True:
+                for scan_type in event_type:
+                    scan_queue = self._incoming_by_type.get(scan_type)
+                    if not scan_queue:
+                        continue
+                    scan_range = range(len(scan_queue))
+                    if reverse:
+                        scan_range = reversed(scan_range)
+                    for elem_index in scan_range:
+                        elem = scan_queue[elem_index]
+                        if self._event_data_match(elem, data_match):
+                            del scan_queue[elem_index]
+                            return elem
+                remaining = endtime - time.time()
+                if (remaining <= 0) or self._stopping:
+                    break
+                self._incoming_condition.wait(remaining)
 
         _LOGGER.debug('elk_event_scan : timeout')
         return False
 
+    @staticmethod
+    def _event_data_match(event, data_match):
+        """True if event data starts with any of data_match (or no data_match)."""
+        if data_match is None:
+            return True
+        return event.data_str.startswith(data_match)
+
     def update(self):
-        """Process any available incoming events."""
-        self.elk_queue_process()
+        """Process any available incoming events.
+
+        Only one drain of the incoming deque runs at a time, if update is
+        called again meanwhile the running drain goes around once more.
+        """
+        with self._update_lock:
+            if self._update_in_progress:
+                self._update_pending = True
+                return
+            self._update_in_progress = True
+        try:
+            while True:
+                self.elk_queue_process()
+                with self._update_lock:
+                    if not self._update_pending:
+                        return
+                    self._update_pending = False
+        finally:
+            with self._update_lock:
+                self._update_in_progress = False
+
+    def _call_later(self, delay, method, *args):
+        """Call method(*args) after delay seconds, from event processing.
+
+        The call is made by whichever thread processes incoming events, so
+        callbacks it triggers stay serialised with those from incoming
+        events. Returns the threading.Timer, which can be cancelled.
+        """
+        timer = threading.Timer(delay, self._call_later_due, (method, args))
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    def _call_later_due(self, method, args):
+        """Queue a _call_later call now that it is due."""
+        self._deferred_calls.append((method, args))
+        if self._synchronous:
+            self.update()
+        else:
+            self._incoming_ready.set()
+
+    def _start_consumer(self):
+        """Start the thread that processes incoming events, unless synchronous."""
+        if self._synchronous:
+            return
+        if (self._consumer_thread is not None) and self._consumer_thread.is_alive():
+            return
+        self._consumer_thread = threading.Thread(target=self._consumer_loop, args=())
+        self._consumer_thread.daemon = True
+        self._consumer_thread.start()
+
+    def _consumer_loop(self):
+        """Thread that processes incoming events off the serial reader thread."""
+        while not self._stopping:
+            self._incoming_ready.wait()
+            self._incoming_ready.clear()
+            if self._stopping:
+                break
+            try:
+                self.update()
+            except Exception:
+                # Don't let one bad event stop all further processing
+                _LOGGER.exception('Error processing incoming events')
 
     def elk_queue_process(self):
         """Process the incoming event deque."""
-        if self._update_in_progress:
-            return
-        self._update_in_progress = True
         _LOGGER.debug('elk_queue_process - checking events')
-        for event in list(self._queue_incoming_elk_events):
-            # Remove stale events over 120 seconds old, normally shouldn't happen
-            if event.age() > 120:
-                self._queue_incoming_elk_events.remove(event)
-                _LOGGER.error('elk_queue_process - removing stale event: ' + str(repr(event.type)))
-            elif event.type in EVENT_LIST_AUTO_PROCESS:
-                # Event is one we handle automatically
-                if (self._rescan_in_progress) and (event.type in EVENT_LIST_RESCAN_BLACKLIST):
-                    # Skip for now, scanning may consume the event instead
-                    _LOGGER.debug('elk_queue_process - rescan in progress, skipping: '\
-                                  + str(repr(event.type)))
-                    continue
-                else:
-                    # Process event
-                    self._queue_incoming_elk_events.remove(event)
-                    if event.type == Event.EVENT_INSTALLER_EXIT:
-                        # Initiate a rescan if the Elk keypad just left
-                        # installer mode and break out of the loop
-                        # This is also sent immediately after RP disconnects
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_INSTALLER_EXIT')
-                        # This needs to be spun into another thread probably, or done async
-                        self.rescan()
-                        return
-                    elif event.type == Event.EVENT_INSTALLER_ELKRP:
-                        # Consume ElkRP Connect events
-                        # but we don't do anything with them except prevent sending events
-                        rp_status = int(event.data_str[0:1])
-                        # Status 0: Elk RP disconnected (IE also sent, no need
-                        # to rescan from RP event)
-                        if rp_status == 0:
-                            self._queue_outgoing_elk_events.clear()
-                            self._connection._elkrp_connected = False
-                            if self._unpaused_status is not None:
-                                self._status = self._unpaused_status
-                                self._unpaused_status = None
-                        # Status 1: Elk RP connected, M1XEP poll reply, this
-                        # occurs in response to commands sent while RP is
-                        # connected
-                        elif rp_status == 1:
-                            self._connection._elkrp_connected = True
-                            if self._status is not self.STATE_PAUSED:
-                                self._unpaused_status = self._status
-                                self._status = self.STATE_PAUSED
-                        # Status 2: Elk RP connected, M1XEP poll reply during
-                        # M1XEP powerup/reboot, this happens during RP
-                        # disconnect sequence before it's completely disco'd
-                        elif rp_status == 2:
-                            self._connection._elkrp_connected = True
-                            if self._status is not self.STATE_PAUSED:
-                                self._unpaused_status = self._status
-                                self._status = self.STATE_PAUSED
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_INSTALLER_ELKRP')
-                        continue
-                    elif event.type == Event.EVENT_ETHERNET_TEST:
-                        # Consume ethernet test events,
-                        # but we don't do anything with them
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_ETHERNET_TEST')
-                        # This is actually a handy way to keep updating our save state without saving on every change
-                        if self._save_needed:
-                            self.state_save()
-                        continue
-                    elif event.type == Event.EVENT_ALARM_MEMORY:
-                        # Alarm Memory update
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_ALARM_MEMORY')
-                        for node_index in range(0, AREA_MAX_COUNT):
-                            self.AREAS[node_index].unpack_event_alarm_memory(event)
-                        continue
-                    elif event.type == Event.EVENT_TROUBLE_STATUS_REPLY:
-                        # TODO: Implement
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_TROUBLE_STATUS_REPLY')
-                        continue
-                    elif event.type == Event.EVENT_ENTRY_EXIT_TIMER:
-                        # Entry/Exit timer started or updated
-                        areanumber = int(event.data[0])
-                        node_index = areanumber - 1
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_ENTRY_EXIT_TIMER')
-                        self.AREAS[node_index].unpack_event_entry_exit_timer(event)
-                        continue
-                    elif event.type == Event.EVENT_USER_CODE_ENTERED:
-                        # User code entered
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_USER_CODE_ENTERED')
-                        keypadnumber = int(event.data_str[15:17])
-                        node_index = keypadnumber - 1
-                        self.KEYPADS[node_index].unpack_event_user_code_entered(event)
-                        self._save_needed = True
-                        continue
-                    elif event.type == Event.EVENT_TASK_UPDATE:
-                        # Task activated
-                        tasknumber = int(event.data_str[:3])
-                        node_index = tasknumber - 1
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_TASK_UPDATE')
-                        self.TASKS[node_index].unpack_event_task_update(event)
-                        continue
-                    elif event.type == Event.EVENT_OUTPUT_UPDATE:
-                        # Output changed state
-                        outputnumber = int(event.data_str[:3])
-                        node_index = outputnumber - 1
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_OUTPUT_UPDATE')
-                        self.OUTPUTS[node_index].unpack_event_output_update(event)
-                        self._save_needed = True
-                        continue
-                    elif event.type == Event.EVENT_ZONE_UPDATE:
-                        # Zone changed state
-                        zonenumber = int(event.data_str[:3])
-                        node_index = zonenumber - 1
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_ZONE_UPDATE')
-                        self.ZONES[node_index].unpack_event_zone_update(event)
-                        self._save_needed = True
-                        continue
-                    elif event.type == Event.EVENT_KEYPAD_STATUS_REPORT:
-                        # Keypad changed state
-                        keypadnumber = int(event.data_str[:2])
-                        node_index = keypadnumber - 1
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_KEYPAD_STATUS_REPORT')
-                        self.KEYPADS[node_index].unpack_event_keypad_status_report(event)
-                        self._save_needed = True
-                        continue
-                    elif event.type == Event.EVENT_ARMING_STATUS_REPORT:
-                        # Alarm status changed
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_ARMING_STATUS_REPORT')
-                        for node_index in range(0, AREA_MAX_COUNT):
-                            self.AREAS[node_index].unpack_event_arming_status_report(event)
-                        self._save_needed = True
-                        continue
-                    elif event.type == Event.EVENT_ALARM_ZONE_REPORT:
-                        # Alarm zone changed
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_ALARM_ZONE_REPORT')
-                        for node_index in range(0, ZONE_MAX_COUNT):
-                            self.ZONES[node_index].unpack_event_alarm_zone(event)
-                        self._save_needed = True
-                        continue
-                    elif event.type == Event.EVENT_TEMP_REQUEST_REPLY:
-                        # Temp sensor update
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_TEMP_REQUEST_REPLY')
-                        group = int(event.data[0])
-                        node_index = int(event.data_str[1:3])-1
-                        if node_index < 0:
-                            continue
-                        if group == 0:
-                            # Group 0 temp probe (Zone 1-16)
-                            self.ZONES[node_index].unpack_event_temp_request_reply(event)
-                            continue
-                        elif group == 1:
-                            # Group 1 temp probe (Keypad)
-                            self.KEYPADS[node_index].unpack_event_temp_request_reply(event)
-                            continue
-                        elif group == 2:
-                            # Group 2 temp probe (Thermostat)
-                            self.THERMOSTATS[node_index].unpack_event_temp_request_reply(event)
-                            continue
-                        self._save_needed = True
-                        continue
-                    elif event.type == Event.EVENT_THERMOSTAT_DATA_REPLY:
-                        # Thermostat update
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_THERMOSTAT_DATA_REPLY')
-                        node_index = int(event.data_str[0:2])-1
-                        if node_index >= 0:
-                            self.THERMOSTATS[node_index].unpack_event_thermostat_data_reply(event)
-                        self._save_needed = True
-                        continue
-                    elif event.type == Event.EVENT_PLC_CHANGE_UPDATE:
-                        # PLC Change Update
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_PLC_CHANGE_UPDATE')
-                        house_code = event.data_str[0]
-                        device_code = int(event.data_str[1:3])
-                        offset = X10.housecode_to_index(hc=house_code+device_code)
-                        self.X10[offset].unpack_event_plc_change_update(event)
-                        self._save_needed = True
-                        continue
-                    elif event.type == Event.EVENT_VERSION_REPLY:
-                        # Version reply
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_VERSION_REPLY')
-                        self.unpack_event_version_reply(event)
-                        self._save_needed = True
-                        continue
-                    elif event.type == Event.EVENT_COUNTER_REPLY:
-                        # Counter reply
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_COUNTER_REPLY')
-                        node_index = int(event.data_str[0:2])-1
-                        if node_index >= 0:
-                            self.COUNTERS[node_index].unpack_event_counter_reply(event)
-                        self._save_needed = True
-                        continue
-                    elif event.type == Event.EVENT_VALUE_READ_REPLY:
-                        # Setting reply
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_VALUE_READ_REPLY')
-                        node_index = int(event.data_str[0:2])-1
-                        _LOGGER.debug('node_index : ' + str(node_index))
-                        if node_index < 0:
-                            # Reply all
-                            for node_index in range(0, SETTING_MAX_COUNT):
-                                self.SETTINGS[node_index].unpack_event_value_read_reply(event)
-                        else:
-                            # Reply one
-                            self.SETTINGS[node_index].unpack_event_value_read_reply(event)
-                        self._save_needed = True
-                        continue
-                    elif event.type == Event.EVENT_RTC_REPLY:
-                        # Real Time Clock data reply
-                        # We don't do anything with this currently
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_RTC_REPLY')
-                        continue
-                    elif event.type == Event.EVENT_OUTPUT_STATUS_REPORT:
-                        # Output Status Report
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_OUTPUT_STATUS_REPORT')
-                        for node_index in range(0, OUTPUT_MAX_COUNT):
-                            self.OUTPUTS[node_index].unpack_event_output_status_report(event)
-                        self._save_needed = True
-                        continue
-                    elif event.type == Event.EVENT_KEYPAD_AREA_REPLY:
-                        # Keypad Area Reply
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_KEYPAD_AREA_REPLY')
-                        for node_index in range(0, KEYPAD_MAX_COUNT):
-                            self.KEYPADS[node_index].unpack_event_keypad_area_reply(event)
-                        self._save_needed = True
-                        continue
-                    elif event.type == Event.EVENT_PLC_STATUS_REPLY:
-                        # PLC Status Reply
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_PLC_STATUS_REPLY')
-                        group_base = int(event.data_str[0])
-                        for node_index in range(group_base, group_base+64):
-                            self.X10[node_index].unpack_event_plc_status_reply(event)
-                        self._save_needed = True
-                        continue
-                    elif event.type == Event.EVENT_ZONE_PARTITION_REPORT:
-                        # Zone Partition Report
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_ZONE_PARTITION_REPORT')
-                        for node_index in range(0, ZONE_MAX_COUNT):
-                            self.ZONES[node_index].unpack_event_zone_partition(event)
-                        self._save_needed = True
-                        continue
-                    elif event.type == Event.EVENT_ZONE_DEFINITION_REPLY:
-                        # Zone Definition Reply
-                        _LOGGER.debug('elk_queue_process - Event.EVENT_ZONE_DEFINITION_REPLY')
-                        for node_index in range(0, ZONE_MAX_COUNT):
-                            self.ZONES[node_index].unpack_event_zone_definition(event)
-                        self._save_needed = True
-                        continue
-                    elif event.type == Event.EVENT_ZONE_STATUS_REPORT:
-                        # Zone Status Report
-                        _LOGGER.debug('elk_queue_process - got Event.EVENT_ZONE_STATUS_REPORT')
-                        for node_index in range(0, ZONE_MAX_COUNT):
-                            self.ZONES[node_index].unpack_event_zone_status_report(event)
-                        self._save_needed = True
-                        continue
-                    elif event.type == Event.EVENT_OMNISTAT_DATA_REPLY:
-                        # Omnistat 2 data reply
-                        _LOGGER.debug('elk_queue_process - got Event.EVENT_OMNISTAT_DATA_REPLY')
-                        for node_index in range(0, THERMOSTAT_MAX_COUNT):
-                            self.THERMOSTATS[node_index].unpack_event_omnistat_data_reply(event)
-                        self._save_needed = True
-                        continue
-        self._update_in_progress = False
+        rescan_in_progress = self._rescan_in_progress
+        with self._incoming_condition:
+            for event_type, scan_queue in self._incoming_by_type.items():
+                # Remove stale events nobody scanned for, oldest are at the front
+                while scan_queue and scan_queue[0].age() > 120:
+                    _LOGGER.error('elk_queue_process - removing stale event: %r', event_type)
+                    scan_queue.popleft()
+                # Once rescan finishes, anything it didn't consume is ours
+                if (not rescan_in_progress) and (event_type in EVENT_LIST_RESCAN_BLACKLIST):
+                    self._queue_incoming_elk_events.extend(scan_queue)
+                    scan_queue.clear()
+        incoming = self._queue_incoming_elk_events
+        # Drop stale events over 120 seconds old, normally shouldn't happen
+        # Events arrive in time order, so only the front can be stale
+        while incoming and incoming[0].age() > 120:
+            event = incoming.popleft()
+            _LOGGER.error('elk_queue_process - removing stale event: %r', event.type)
+        # Bind loop invariants locally, this loop runs for every event
+        next_event = incoming.popleft
+        handler_get = self._event_handlers.get
+        event_release = self._event_pool.release
+        number_events = Event.NUMBER_FIELD
+        while incoming:
+            event = next_event()
+            event_type = event.type
+            handler = handler_get(event_type)
+            if handler is None:
+                continue
+            if (event.number is None) and (event_type in number_events):
+                # Device number didn't parse, nothing to address it to
+                _LOGGER.error('elk_queue_process - invalid device number, skipping: %r',
+                              event_type)
+                event_release(event)
+                continue
+            if (rescan_in_progress) and (event_type in EVENT_LIST_RESCAN_BLACKLIST):
+                # Skip for now, hand to scanning which may consume the event instead
+                _LOGGER.debug('elk_queue_process - rescan in progress, skipping: %r',
+                              event_type)
+                with self._incoming_condition:
+                    self._incoming_by_type[event_type].append(event)
+                    self._incoming_condition.notify_all()
+                continue
+            handler(event)
+            # Handlers only copy values out of the event, so it can be reused
+            event_release(event)
+        deferred_calls = self._deferred_calls
+        while deferred_calls:
+            method, args = deferred_calls.popleft()
+            method(*args)
+
+    def _handle_installer_exit(self, event):
+        """Initiate a rescan if the Elk keypad just left installer mode.
+
+        This is also sent immediately after RP disconnects.
+        """
+        _LOGGER.debug('elk_queue_process - Event.EVENT_INSTALLER_EXIT')
+        # This needs to be spun into another thread probably, or done async
+        self.rescan()
+
+    def _handle_installer_elkrp(self, event):
+        """Consume ElkRP Connect events.
+
+        We don't do anything with them except prevent sending events.
+        """
+        rp_status = int(event.data_str[0:1])
+        # Status 0: Elk RP disconnected (IE also sent, no need
+        # to rescan from RP event)
+        if rp_status == 0:
+            self._queue_outgoing_elk_events.clear()
+            self._connection._elkrp_connected = False
+            if self._unpaused_status is not None:
+                self._status = self._unpaused_status
+                self._unpaused_status = None
+        # Status 1: Elk RP connected, M1XEP poll reply, this
+        # occurs in response to commands sent while RP is
+        # connected
+        # Status 2: Elk RP connected, M1XEP poll reply during
+        # M1XEP powerup/reboot, this happens during RP
+        # disconnect sequence before it's completely disco'd
+        elif rp_status == 1 or rp_status == 2:
+            self._connection._elkrp_connected = True
+            if self._status is not self.STATE_PAUSED:
+                self._unpaused_status = self._status
+                self._status = self.STATE_PAUSED
+        _LOGGER.debug('elk_queue_process - Event.EVENT_INSTALLER_ELKRP')
+
+    def _handle_ethernet_test(self, event):
+        """Consume ethernet test events, but we don't do anything with them."""
+        _LOGGER.debug('elk_queue_process - Event.EVENT_ETHERNET_TEST')
+        # This is actually a handy way to keep updating our save state without saving on every change
+        if self._save_needed:
+            self.state_save()
+
+    def _handle_alarm_memory(self, event):
+        """Alarm Memory update."""
+        _LOGGER.debug('elk_queue_process - Event.EVENT_ALARM_MEMORY')
+        for node_index in range(0, AREA_MAX_COUNT):
+            self.AREAS[node_index].unpack_event_alarm_memory(event)
+
+    def _handle_trouble_status_reply(self, event):
+        """Trouble status reply."""
+        # TODO: Implement
+        _LOGGER.debug('elk_queue_process - Event.EVENT_TROUBLE_STATUS_REPLY')
+
+    def _handle_entry_exit_timer(self, event):
+        """Entry/Exit timer started or updated."""
+        node_index = event.number - 1
+        _LOGGER.debug('elk_queue_process - Event.EVENT_ENTRY_EXIT_TIMER')
+        self.AREAS[node_index].unpack_event_entry_exit_timer(event)
+
+    def _handle_user_code_entered(self, event):
+        """User code entered."""
+        _LOGGER.debug('elk_queue_process - Event.EVENT_USER_CODE_ENTERED')
+        node_index = event.number - 1
+        self.KEYPADS[node_index].unpack_event_user_code_entered(event)
+        self._save_needed = True
+
+    def _handle_task_update(self, event):
+        """Task activated."""
+        node_index = event.number - 1
+        _LOGGER.debug('elk_queue_process - Event.EVENT_TASK_UPDATE')
+        self.TASKS[node_index].unpack_event_task_update(event)
+
+    def _handle_output_update(self, event):
+        """Output changed state."""
+        node_index = event.number - 1
+        _LOGGER.debug('elk_queue_process - Event.EVENT_OUTPUT_UPDATE')
+        self.OUTPUTS[node_index].unpack_event_output_update(event)
+        self._save_needed = True
+
+    def _handle_zone_update(self, event):
+        """Zone changed state."""
+        node_index = event.number - 1
+        _LOGGER.debug('elk_queue_process - Event.EVENT_ZONE_UPDATE')
+        self.ZONES[node_index].unpack_event_zone_update(event)
+        self._save_needed = True
+
+    def _handle_keypad_status_report(self, event):
+        """Keypad changed state."""
+        node_index = event.number - 1
+        _LOGGER.debug('elk_queue_process - Event.EVENT_KEYPAD_STATUS_REPORT')
+        self.KEYPADS[node_index].unpack_event_keypad_status_report(event)
+        self._save_needed = True
+
+    def _handle_arming_status_report(self, event):
+        """Alarm status changed."""
+        _LOGGER.debug('elk_queue_process - Event.EVENT_ARMING_STATUS_REPORT')
+        # Decode once for all areas
+        data = event.data_dehex()
+        alarm = event.data_dehex(True)
+        event_time = event.time
+        for node_index in range(0, AREA_MAX_COUNT):
+            self.AREAS[node_index]._update_arming_status(
+                data[node_index], data[8+node_index], alarm[16+node_index], event_time)
+        self._save_needed = True
+
+    def _handle_alarm_zone_report(self, event):
+        """Alarm zone changed."""
+        _LOGGER.debug('elk_queue_process - Event.EVENT_ALARM_ZONE_REPORT')
+        # Decode once for all zones
+        alarm = event.data_dehex(True)
+        event_time = event.time
+        for node_index in range(0, ZONE_MAX_COUNT):
+            self.ZONES[node_index]._update_alarm(alarm[node_index], event_time)
+        self._save_needed = True
+
+    def _handle_temp_request_reply(self, event):
+        """Temp sensor update."""
+        _LOGGER.debug('elk_queue_process - Event.EVENT_TEMP_REQUEST_REPLY')
+        group = int(event.data_str[0])
+        node_index = event.number - 1
+        if node_index < 0:
+            return
+        if group == 0:
+            # Group 0 temp probe (Zone 1-16)
+            self.ZONES[node_index].unpack_event_temp_request_reply(event)
+        elif group == 1:
+            # Group 1 temp probe (Keypad)
+            self.KEYPADS[node_index].unpack_event_temp_request_reply(event)
+        elif group == 2:
+            # Group 2 temp probe (Thermostat)
+            self.THERMOSTATS[node_index].unpack_event_temp_request_reply(event)
+        else:
+            self._save_needed = True
+
+    def _handle_thermostat_data_reply(self, event):
+        """Thermostat update."""
+        _LOGGER.debug('elk_queue_process - Event.EVENT_THERMOSTAT_DATA_REPLY')
+        node_index = event.number - 1
+        if node_index >= 0:
+            self.THERMOSTATS[node_index].unpack_event_thermostat_data_reply(event)
+        self._save_needed = True
+
+    def _handle_plc_change_update(self, event):
+        """PLC Change Update."""
+        _LOGGER.debug('elk_queue_process - Event.EVENT_PLC_CHANGE_UPDATE')
+        offset = X10.HOUSECODE_INDEX.get(event.data_str[0:3])
+        if offset is None:
+            # Unit code '00' is used for All commands, not a device
+            return
+        self.X10[offset].unpack_event_plc_change_update(event)
+        self._save_needed = True
+
+    def _handle_version_reply(self, event):
+        """Version reply."""
+        _LOGGER.debug('elk_queue_process - Event.EVENT_VERSION_REPLY')
+        self.unpack_event_version_reply(event)
+        self._save_needed = True
+
+    def _handle_counter_reply(self, event):
+        """Counter reply."""
+        _LOGGER.debug('elk_queue_process - Event.EVENT_COUNTER_REPLY')
+        node_index = event.number - 1
+        if node_index >= 0:
+            self.COUNTERS[node_index].unpack_event_counter_reply(event)
+        self._save_needed = True
+
+    def _handle_value_read_reply(self, event):
+        """Setting reply."""
+        _LOGGER.debug('elk_queue_process - Event.EVENT_VALUE_READ_REPLY')
+        node_index = event.number - 1
+        _LOGGER.debug('node_index : %s', node_index)
+        if node_index < 0:
+            # Reply all
+            for node_index in range(0, SETTING_MAX_COUNT):
+                self.SETTINGS[node_index].unpack_event_value_read_reply(event)
+        else:
+            # Reply one
+            self.SETTINGS[node_index].unpack_event_value_read_reply(event)
+        self._save_needed = True
+
+    def _handle_rtc_reply(self, event):
+        """Real Time Clock data reply.
+
+        We don't do anything with this currently.
+        """
+        _LOGGER.debug('elk_queue_process - Event.EVENT_RTC_REPLY')
+
+    def _handle_output_status_report(self, event):
+        """Output Status Report."""
+        _LOGGER.debug('elk_queue_process - Event.EVENT_OUTPUT_STATUS_REPORT')
+        # Decode once, and only call into outputs whose status changed
+        data = event.data_dehex()
+        event_time = event.time
+        outputs = self.OUTPUTS
+        for node_index in range(0, OUTPUT_MAX_COUNT):
+            output = outputs[node_index]
+            if output._status != data[node_index]:
+                output._update_status(data[node_index], event_time)
+        self._save_needed = True
+
+    def _handle_keypad_area_reply(self, event):
+        """Keypad Area Reply."""
+        _LOGGER.debug('elk_queue_process - Event.EVENT_KEYPAD_AREA_REPLY')
+        # Several keypads usually share an area, call each area back once
+        # for the whole report rather than once per keypad
+        data = event.data_dehex(True)
+        event_time = event.time
+        area_indexes = set()
+        for node_index in range(0, KEYPAD_MAX_COUNT):
+            area_index = self.KEYPADS[node_index]._update_area(data[node_index], event_time)
+            # Keypads not assigned to an area report area 0 (index -1)
+            if area_index >= 0:
+                area_indexes.add(area_index)
+        for area_index in sorted(area_indexes):
+            self.AREAS[area_index]._updated_at = event_time
+            self.AREAS[area_index]._callback()
+        self._save_needed = True
+
+    def _handle_plc_status_reply(self, event):
+        """PLC Status Reply."""
+        _LOGGER.debug('elk_queue_process - Event.EVENT_PLC_STATUS_REPLY')
+        group_base = int(event.data_str[0])
+        for node_index in range(group_base, group_base+64):
+            self.X10[node_index].unpack_event_plc_status_reply(event)
+        self._save_needed = True
+
+    def _handle_zone_partition_report(self, event):
+        """Zone Partition Report."""
+        _LOGGER.debug('elk_queue_process - Event.EVENT_ZONE_PARTITION_REPORT')
+        for node_index in range(0, ZONE_MAX_COUNT):
+            self.ZONES[node_index].unpack_event_zone_partition(event)
+        self._save_needed = True
+
+    def _handle_zone_definition_reply(self, event):
+        """Zone Definition Reply."""
+        _LOGGER.debug('elk_queue_process - Event.EVENT_ZONE_DEFINITION_REPLY')
+        for node_index in range(0, ZONE_MAX_COUNT):
+            self.ZONES[node_index].unpack_event_zone_definition(event)
+        self._save_needed = True
+
+    def _handle_zone_status_report(self, event):
+        """Zone Status Report."""
+        _LOGGER.debug('elk_queue_process - got Event.EVENT_ZONE_STATUS_REPORT')
+        for node_index in range(0, ZONE_MAX_COUNT):
+            self.ZONES[node_index].unpack_event_zone_status_report(event)
+        self._save_needed = True
+
+    def _handle_omnistat_data_reply(self, event):
+        """Omnistat 2 data reply."""
+        _LOGGER.debug('elk_queue_process - got Event.EVENT_OMNISTAT_DATA_REPLY')
+        for node_index in range(0, THERMOSTAT_MAX_COUNT):
+            self.THERMOSTATS[node_index].unpack_event_omnistat_data_reply(event)
+        self._save_needed = True
 
     def get_version(self):
         """Get Elk and (if available) M1XEP version information."""
@@ -930,16 +1153,20 @@ class Elk(Node):
 
     def scan_version(self):
         """Scan Elk system version."""
-        event = Event()
-        event.type = Event.EVENT_VERSION
-        self.elk_event_send(event)
+        self.elk_event_request(Event.EVENT_VERSION)
 
     def scan_zones(self):
         """Scan all Zones and their information."""
+        # Request everything up front, the replies are typed so the
+        # panel can work through them while we wait on each in turn
         # Get Zone status report
-        event = Event()
-        event.type = Event.EVENT_ZONE_STATUS
-        self.elk_event_send(event)
+        self.elk_event_request(Event.EVENT_ZONE_STATUS)
+        # Get Zone definition type configuration
+        self.elk_event_request(Event.EVENT_ZONE_DEFINITION)
+        # Get Zone alarm type configuration
+        self.elk_event_request(Event.EVENT_ALARM_ZONE)
+        # Get Zone area (partition) assignments
+        self.elk_event_request(Event.EVENT_ZONE_PARTITION)
         reply = self.elk_event_scan(Event.EVENT_ZONE_STATUS_REPORT, timeout=30)
         if reply:
             _LOGGER.debug('scan_zones : got Event.EVENT_ZONE_STATUS_REPORT')
@@ -947,98 +1174,48 @@ class Elk(Node):
                 self.ZONES[node_index].unpack_event_zone_status_report(reply)
         else:
             _LOGGER.debug('scan_zones : timeout waiting for Event.EVENT_ZONE_STATUS_REPORT')
-        # Get Zone definition type configuration
-        event = Event()
-        event.type = Event.EVENT_ZONE_DEFINITION
-        self.elk_event_send(event)
         reply = self.elk_event_scan(Event.EVENT_ZONE_DEFINITION_REPLY)
         if reply:
             _LOGGER.debug('scan_zones : got Event.EVENT_ZONE_DEFINITION_REPLY')
             for node_index in range(0, ZONE_MAX_COUNT):
                 self.ZONES[node_index].unpack_event_zone_definition(reply)
-        # Get Zone alarm type configuration
-        event = Event()
-        event.type = Event.EVENT_ALARM_ZONE
-        self.elk_event_send(event)
-        # Get Zone area (partition) assignments
-        event = Event()
-        event.type = Event.EVENT_ZONE_PARTITION
-        self.elk_event_send(event)
         # Check for Analog zones
         for node_index in range(0, ZONE_MAX_COUNT):
             if (self.ZONES[node_index].definition
                     == Zone.DEFINITION_ANALOG_ZONE)\
             and (self.ZONES[node_index].included is True):
-                event = Event()
-                event.type = Event.EVENT_ZONE_VOLTAGE
-                event.data_str = format(self.ZONES[node_index].number, '03')
-                self.elk_event_send(event)
+                self.elk_event_request(Event.EVENT_ZONE_VOLTAGE, format(self.ZONES[node_index].number, '03'))
         # Check for Temperature zones on Zones 1-16
         for node_index in range(0, ZONE_MAX_TEMP_COUNT):
             if (self.ZONES[node_index].definition == Zone.DEFINITION_TEMPERATURE)\
             and (self.ZONES[node_index].included is True):
-                event = Event()
-                event.type = Event.EVENT_TEMP_REQUEST
-                event.data_str = '0' + format(self.ZONES[node_index].number, '02')
-                self.elk_event_send(event)
+                self.elk_event_request(Event.EVENT_TEMP_REQUEST, '0' + format(self.ZONES[node_index].number, '02'))
         # Get Zone descriptions
-        desc_index = 1
-        while (desc_index) and (desc_index <= ZONE_MAX_COUNT):
-            if self.ZONES[desc_index-1].included is True:
-                desc_index = self.get_description(Event.DESCRIPTION_ZONE_NAME,
-                                                  desc_index)
-            else:
-                desc_index = desc_index + 1
+        self.scan_descriptions(Event.DESCRIPTION_ZONE_NAME, self.ZONES)
 
     def scan_outputs(self):
         """Scan all Outputs and their information."""
-        event = Event()
-        event.type = Event.EVENT_OUTPUT_STATUS
-        self.elk_event_send(event)
+        self.elk_event_request(Event.EVENT_OUTPUT_STATUS)
 
-        desc_index = 1
-        while (desc_index) and (desc_index <= OUTPUT_MAX_COUNT):
-            if self.OUTPUTS[desc_index-1].included is True:
-                desc_index = self.get_description(
-                    Event.DESCRIPTION_OUTPUT_NAME, desc_index)
-            else:
-                desc_index = desc_index + 1
+        self.scan_descriptions(Event.DESCRIPTION_OUTPUT_NAME, self.OUTPUTS)
 
     def scan_areas(self):
         """Scan all Areas and their information."""
-        event = Event()
-        event.type = Event.EVENT_ARMING_STATUS
-        self.elk_event_send(event)
+        self.elk_event_request(Event.EVENT_ARMING_STATUS)
 
-        desc_index = 1
-        while (desc_index) and (desc_index <= AREA_MAX_COUNT):
-            if self.AREAS[desc_index-1].included is True:
-                desc_index = self.get_description(Event.DESCRIPTION_AREA_NAME,
-                                                  desc_index)
-            else:
-                desc_index = desc_index + 1
+        self.scan_descriptions(Event.DESCRIPTION_AREA_NAME, self.AREAS)
 
     def scan_keypads(self):
         """Scan all Keypads and their information."""
-        event = Event()
-        event.type = Event.EVENT_KEYPAD_AREA
-        self.elk_event_send(event)
-        for node_index in range(0, KEYPAD_MAX_COUNT):
-            if self.KEYPADS[node_index].included is True:
-                event = Event()
-                event.type = Event.EVENT_KEYPAD_STATUS
-                event.data_str = format(self.KEYPADS[node_index].number, '02')
-                self.elk_event_send(event)
-                event = Event()
-                event.type = Event.EVENT_TEMP_REQUEST
-                event.data_str = '1' + format(self.KEYPADS[node_index].number, '02')
-                self.elk_event_send(event)
-        desc_index = 1
-        while (desc_index) and (desc_index <= KEYPAD_MAX_COUNT):
-            if self.KEYPADS[desc_index-1].included is True:
-                desc_index = self.get_description(Event.DESCRIPTION_KEYPAD_NAME, desc_index)
-            else:
-                desc_index = desc_index + 1
+        self.elk_event_request(Event.EVENT_KEYPAD_AREA)
+        # Status for all keypads first, temperatures after, the replies
+        # are handled as they arrive so there is nothing to wait for
+        keypads = [keypad for keypad in self.KEYPADS if keypad.included is True]
+        for keypad in keypads:
+            self.elk_event_request(Event.EVENT_KEYPAD_STATUS, format(keypad.number, '02'))
+        for keypad in keypads:
+            self.elk_event_request(Event.EVENT_TEMP_REQUEST, '1' + format(keypad.number, '02'))
+        self.scan_descriptions(Event.DESCRIPTION_KEYPAD_NAME, self.KEYPADS)
 
     def scan_thermostats(self):
         """Scan all Thermostats and their information."""
@@ -1046,12 +1223,7 @@ class Elk(Node):
             if self.THERMOSTATS[node_index].included is True:
                 self.THERMOSTATS[node_index].request_data()
                 self.THERMOSTATS[node_index].detect_omni()
-        desc_index = 1
-        while (desc_index) and (desc_index <= THERMOSTAT_MAX_COUNT):
-            if self.THERMOSTATS[desc_index-1].included is True:
-                desc_index = self.get_description(Event.DESCRIPTION_THERMOSTAT_NAME, desc_index)
-            else:
-                desc_index = desc_index + 1
+        self.scan_descriptions(Event.DESCRIPTION_THERMOSTAT_NAME, self.THERMOSTATS)
 
     def scan_x10(self):
         """Scan all X10 devices and their information."""
@@ -1063,119 +1235,122 @@ class Elk(Node):
                     group_excluded = False
             if group_excluded is True:
                 continue
-            event = Event()
-            event.type = Event.EVENT_PLC_STATUS_REQUEST
-            event.data_str = format(node_index_group, '01')
-            self.elk_event_send(event)
-
-        desc_index = 1
-        while (desc_index) and (desc_index <= X10_MAX_COUNT):
-            if self.X10[desc_index-1].included is True:
-                desc_index = self.get_description(Event.DESCRIPTION_LIGHT_NAME, desc_index)
-            else:
-                desc_index = desc_index + 1
+            self.elk_event_request(Event.EVENT_PLC_STATUS_REQUEST, format(node_index_group, '01'))
+
+        self.scan_descriptions(Event.DESCRIPTION_LIGHT_NAME, self.X10)
 
     def scan_tasks(self):
         """Scan all Tasks and their information."""
-        desc_index = 1
-        while (desc_index) and (desc_index <= TASK_MAX_COUNT):
-            if self.TASKS[desc_index-1].included is True:
-                desc_index = self.get_description(Event.DESCRIPTION_TASK_NAME, desc_index)
-            else:
-                desc_index = desc_index + 1
+        self.scan_descriptions(Event.DESCRIPTION_TASK_NAME, self.TASKS)
 
     def scan_users(self):
         """Scan all Users and their information."""
-        desc_index = 1
-        while (desc_index) and (desc_index <= USER_MAX_COUNT):
-            if self.USERS[desc_index-1].included is True:
-                desc_index = self.get_description(Event.DESCRIPTION_USER_NAME, desc_index)
-            else:
-                desc_index = desc_index + 1
+        self.scan_descriptions(Event.DESCRIPTION_USER_NAME, self.USERS)
 
     def scan_counters(self):
         """Scan all Counters and their information."""
         for node_index in range(0, COUNTER_MAX_COUNT):
             if self.COUNTERS[node_index].included is True:
-                event = Event()
-                event.type = Event.EVENT_COUNTER_READ
-                event.data_str = format(self.COUNTERS[node_index].number, '02')
-                self.elk_event_send(event)
-        desc_index = 1
-        while (desc_index) and (desc_index <= COUNTER_MAX_COUNT):
-            if self.COUNTERS[desc_index-1].included is True:
-                desc_index = self.get_description(Event.DESCRIPTION_COUNTER_NAME, desc_index)
-            else:
-                desc_index = desc_index + 1
+                self.elk_event_request(Event.EVENT_COUNTER_READ, format(self.COUNTERS[node_index].number, '02'))
+        self.scan_descriptions(Event.DESCRIPTION_COUNTER_NAME, self.COUNTERS)
 
     def scan_settings(self):
         """Scan all Settings and their information."""
-        event = Event()
-        event.type = Event.EVENT_VALUE_READ_ALL
-        self.elk_event_send(event)
-        desc_index = 1
-        while (desc_index) and (desc_index <= SETTING_MAX_COUNT):
-            if self.SETTINGS[desc_index-1].included is True:
-                desc_index = self.get_description(Event.DESCRIPTION_CUSTOM_SETTING_NAME, desc_index)
-            else:
-                desc_index = desc_index + 1
+        self.elk_event_request(Event.EVENT_VALUE_READ_ALL)
+        self.scan_descriptions(Event.DESCRIPTION_CUSTOM_SETTING_NAME, self.SETTINGS)
 
-    def get_description(self, description_type, number):
-        """Request string description from Elk.
+    def scan_descriptions(self, description_type, devices, window=4):
+        """Request string descriptions for all included devices of a type.
 
-        If there is nothing set for the requested description,
-        the Elk will return the next valid description instead,
-        so we must check the returned description and set accordingly.
+        Keeps up to window requests outstanding rather than waiting for
+        each reply before sending the next request. Replies arrive in
+        request order, and since the Elk replies with the next valid
+        description, anything below a reply's number needs no request.
 
         description_type: Type of description to request.
-        number: Index of description type (i.e. Zone number).
+        devices: List of devices of that type (i.e. self.ZONES).
+        window: Maximum number of requests outstanding at once.
         """
-        event = Event()
-        event.type = Event.EVENT_DESCRIPTION
-        data = format(description_type, '02') + format(number, '03')
-        event.data_str = data
-        self.elk_event_send(event)
-        reply = self.elk_event_scan(Event.EVENT_DESCRIPTION_REPLY)
-        if reply:
-            _LOGGER.debug('get_description : got Event.EVENT_DESCRIPTION_REPLY')
+        type_str = format(description_type, '02')
+        max_count = len(devices)
+        pending = deque()
+        next_number = 1
+        last_number = 0
+        while True:
+            # Keep the window of outstanding requests full
+            while (len(pending) < window) and (next_number <= max_count):
+                if devices[next_number-1].included is True:
+                    self.elk_event_request(Event.EVENT_DESCRIPTION,
+                                           type_str + format(next_number, '03'))
+                    pending.append(next_number)
+                next_number = next_number + 1
+            if not pending:
+                return
+            number = pending.popleft()
+            reply = self.elk_event_scan(Event.EVENT_DESCRIPTION_REPLY, data_match=type_str)
+            if not reply:
+                _LOGGER.debug('scan_descriptions : timeout waiting for Event.EVENT_DESCRIPTION_REPLY')
+                return
+            if number <= last_number:
+                # Already answered by the reply to an earlier request
+                continue
+            reply_number = self._description_reply_apply(reply, number)
+            if not reply_number:
+                # Nothing described from here on, stop requesting more
+                next_number = max_count + 1
+            else:
+                last_number = reply_number
+                if reply_number >= next_number:
+                    # Skip past numbers the Elk told us have no description
+                    next_number = reply_number + 1
+
+    def _description_reply_apply(self, reply, number):
+        """Set description from Event.EVENT_DESCRIPTION_REPLY.
+
+        reply: Reply to a description request for number.
+        number: Index the description was requested for.
+        Returns the index described, or False if the Elk has
+        no descriptions from number onwards.
+        """
+        if _LOGGER.isEnabledFor(logging.DEBUG):
             reply.dump()
-            reply_type = int(reply.data_str[:2])
-            reply_number = int(reply.data_str[2:5])
-            reply_name = reply.data_str[5:21]
-            if reply_number >= number:
-                node_index = reply_number - 1
-                if reply_type == Event.DESCRIPTION_ZONE_NAME:
-                    self.ZONES[node_index].description = reply_name.strip()
-                    self.ZONES[node_index].callback_trigger()
-                elif reply_type == Event.DESCRIPTION_OUTPUT_NAME:
-                    self.OUTPUTS[node_index].description = reply_name.strip()
-                    self.OUTPUTS[node_index].callback_trigger()
-                elif reply_type == Event.DESCRIPTION_AREA_NAME:
-                    self.AREAS[node_index].description = reply_name.strip()
-                    self.AREAS[node_index].callback_trigger()
-                elif reply_type == Event.DESCRIPTION_KEYPAD_NAME:
-                    self.KEYPADS[node_index].description = reply_name.strip()
-                    self.KEYPADS[node_index].callback_trigger()
-                elif reply_type == Event.DESCRIPTION_LIGHT_NAME:
-                    self.X10[node_index].description = reply_name.strip()
-                    self.X10[node_index].callback_trigger()
-                elif reply_type == Event.DESCRIPTION_TASK_NAME:
-                    self.TASKS[node_index].description = reply_name.strip()
-                    self.TASKS[node_index].callback_trigger()
-                elif reply_type == Event.DESCRIPTION_USER_NAME:
-                    self.USERS[node_index].description = reply_name.strip()
-                    self.USERS[node_index].callback_trigger()
-                elif reply_type == Event.DESCRIPTION_COUNTER_NAME:
-                    self.COUNTERS[node_index].description = reply_name.strip()
-                    self.COUNTERS[node_index].callback_trigger()
-                elif reply_type == Event.DESCRIPTION_CUSTOM_SETTING_NAME:
-                    self.SETTINGS[node_index].description = reply_name.strip()
-                    self.SETTINGS[node_index].callback_trigger()
-                elif reply_type == Event.DESCRIPTION_THERMOSTAT_NAME:
-                    self.THERMOSTATS[node_index].description = reply_name.strip()
-                    self.THERMOSTATS[node_index].callback_trigger()
-                return reply_number+1
-        return False
+        reply_type = int(reply.data_str[:2])
+        reply_number = int(reply.data_str[2:5])
+        reply_name = reply.data_str[5:21]
+        if reply_number < number:
+            return False
+        node_index = reply_number - 1
+        if reply_type == Event.DESCRIPTION_ZONE_NAME:
+            self.ZONES[node_index].description = reply_name.strip()
+            self.ZONES[node_index].callback_trigger()
+        elif reply_type == Event.DESCRIPTION_OUTPUT_NAME:
+            self.OUTPUTS[node_index].description = reply_name.strip()
+            self.OUTPUTS[node_index].callback_trigger()
+        elif reply_type == Event.DESCRIPTION_AREA_NAME:
+            self.AREAS[node_index].description = reply_name.strip()
+            self.AREAS[node_index].callback_trigger()
+        elif reply_type == Event.DESCRIPTION_KEYPAD_NAME:
+            self.KEYPADS[node_index].description = reply_name.strip()
+            self.KEYPADS[node_index].callback_trigger()
+        elif reply_type == Event.DESCRIPTION_LIGHT_NAME:
+            self.X10[node_index].description = reply_name.strip()
+            self.X10[node_index].callback_trigger()
+        elif reply_type == Event.DESCRIPTION_TASK_NAME:
+            self.TASKS[node_index].description = reply_name.strip()
+            self.TASKS[node_index].callback_trigger()
+        elif reply_type == Event.DESCRIPTION_USER_NAME:
+            self.USERS[node_index].description = reply_name.strip()
+            self.USERS[node_index].callback_trigger()
+        elif reply_type == Event.DESCRIPTION_COUNTER_NAME:
+            self.COUNTERS[node_index].description = reply_name.strip()
+            self.COUNTERS[node_index].callback_trigger()
+        elif reply_type == Event.DESCRIPTION_CUSTOM_SETTING_NAME:
+            self.SETTINGS[node_index].description = reply_name.strip()
+            self.SETTINGS[node_index].callback_trigger()
+        elif reply_type == Event.DESCRIPTION_THERMOSTAT_NAME:
+            self.THERMOSTATS[node_index].description = reply_name.strip()
+            self.THERMOSTATS[node_index].callback_trigger()
+        return reply_number
 
     @staticmethod
     def _list_from_ranges(data):
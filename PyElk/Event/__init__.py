@@ -1,13 +1,31 @@
-from collections import namedtuple
-from collections import deque
 import logging
-import time
-import traceback
+import sys
+from time import time as _time_now
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _dehex_value(character, fake):
+    """Value of one ASCII hex (or fake hex) character, see Event.data_dehex."""
+    value = character - ord('0')
+    if (not fake) and (value > 9):
+        value = value - 7
+    # Characters below '0' are never valid, don't go negative
+    return max(value, 0)
+
+# Translation tables from ASCII (fake) hex characters to their values
+_DEHEX = bytes(_dehex_value(c, False) for c in range(0, 256))
+_DEHEX_FAKE = bytes(_dehex_value(c, True) for c in range(0, 256))
+_DEHEX_STR = dict((c, str(_dehex_value(c, False))) for c in range(0, 256))
+_DEHEX_STR_FAKE = dict((c, str(_dehex_value(c, True))) for c in range(0, 256))
+
+
 class Event(object):
+    # Lots of these get created, keep them small
+    __slots__ = ('_pyelk', '_len', '_type', '_data', '_data_str', '_reserved',
+                 '_checksum', '_line', '_number', '_time', '_retries', '_expect',
+                 '_retry_delay', '_retry_remove_all', '_dehex', '_dehex_fake')
+
     EVENT_INSTALLER_ELKRP = 'RP' # ELKRP Connected
     EVENT_INSTALLER_EXIT = 'IE' # Installer Program Mode Exited
 
@@ -207,19 +225,45 @@ class Event(object):
         'rw' : EVENT_RTC_WRITE,
     }
 
+    # Position of the device number field within data for events
+    # addressed to a single device, parsed once in parse()
+    NUMBER_FIELD = {
+        EVENT_COUNTER_REPLY : (0, 2),
+        EVENT_ENTRY_EXIT_TIMER : (0, 1),
+        EVENT_KEYPAD_STATUS_REPORT : (0, 2),
+        EVENT_OUTPUT_UPDATE : (0, 3),
+        EVENT_TASK_UPDATE : (0, 3),
+        EVENT_TEMP_REQUEST_REPLY : (1, 3),
+        EVENT_THERMOSTAT_DATA_REPLY : (0, 2),
+        EVENT_USER_CODE_ENTERED : (15, 17),
+        EVENT_VALUE_READ_REPLY : (0, 2),
+        EVENT_ZONE_UPDATE : (0, 3),
+    }
+
     def __init__(self, pyelk=None):
         """Initialize Event object.
 
         pyelk: Pyelk.Elk object that this object is for (default None).
         """
+        self._pyelk = pyelk
+        self.reset()
+
+    def reset(self):
+        """Reset Event to a new, empty event so it can be reused."""
         self._len = 0
         self._type = ''
         self._data = []
         self._data_str = ''
+        # data_dehex results, cached until data_str changes
+        self._dehex = None
+        self._dehex_fake = None
         self._reserved = '00'
         self._checksum = ''
-        self._time = time.time()
-        self._pyelk = pyelk
+        # Formatted line, cached by to_string until a field changes
+        self._line = None
+        # Device number (1-based) parsed from data, see NUMBER_FIELD
+        self._number = None
+        self._time = _time_now()
         # Number of retries to attempt
         self._retries = 0
         # Packet to expect to avoid retry
@@ -240,14 +284,19 @@ class Event(object):
     @type.setter
     def type(self, value):
         self._type = value
+        self._line = None
 
     @property
     def data(self):
+        # Parsed events only build the list of characters if asked
+        if self._data is None:
+            self._data = list(self._data_str)
         return self._data
 
     @data.setter
     def data(self, value):
         self._data = value
+        self._line = None
 
     @property
     def data_str(self):
@@ -256,6 +305,13 @@ class Event(object):
     @data_str.setter
     def data_str(self, value):
         self._data_str = value
+        self._line = None
+        self._dehex = None
+        self._dehex_fake = None
+
+    @property
+    def number(self):
+        return self._number
 
     @property
     def time(self):
@@ -291,29 +347,33 @@ class Event(object):
 
     def age(self):
         """Age of the event (time since event was received)."""
-        return time.time() - self._time
+        return _time_now() - self._time
 
     def dump(self):
         """Dump debugging data, to be removed."""
-        _LOGGER.debug('Event Len: ' + str(repr(self._len)))
-        _LOGGER.debug('Event Type: ' + str(repr(self._type)))
-        _LOGGER.debug('Event Data: ' + str(repr(self._data)))
-        _LOGGER.debug('Event Data Str: ' + repr(self._data))
-        _LOGGER.debug('Event Checksum: ' + str(repr(self._checksum)))
-        _LOGGER.debug('Event Computed Checksum: ' + str(self.checksum_generate()))
+        if not _LOGGER.isEnabledFor(logging.DEBUG):
+            return
+        _LOGGER.debug('Event Len: %r', self._len)
+        _LOGGER.debug('Event Type: %r', self._type)
+        _LOGGER.debug('Event Data: %r', self.data)
+        _LOGGER.debug('Event Data Str: %r', self._data_str)
+        _LOGGER.debug('Event Checksum: %r', self._checksum)
+        _LOGGER.debug('Event Computed Checksum: %s', self.checksum_generate())
 
     def parse(self, data):
         """Parse event packet."""
-        _LOGGER.debug('Parsing: {}\n'.format(repr(data)))
+        _LOGGER.debug('Parsing: %r', data)
         end_padding = 4
         self._len = data[:2]
-        self._type = data[2:4]
+        # Interned so comparisons against the EVENT_* literals (which
+        # are already interned) and handler lookups short-circuit on identity
+        self._type = sys.intern(data[2:4])
         # Some events don't have reserved data
         if self._type == Event.EVENT_ALARM_MEMORY:
             end_padding = 2
         if len(data) > 8:
             self._data_str = data[4:-end_padding]
-            self._data = list(self._data_str)
+            self._data = None
         else:
             self._data_str = ''
             self._data = []
@@ -322,40 +382,69 @@ class Event(object):
         else:
             self._reserved = ''
         self._checksum = data[-2:]
+        self._line = None
+        self._dehex = None
+        self._dehex_fake = None
+        number_field = self.NUMBER_FIELD.get(self._type)
+        if number_field is not None:
+            try:
+                self._number = int(self._data_str[number_field[0]:number_field[1]])
+            except ValueError:
+                # Corrupt number field, handlers skip events without one
+                self._number = None
 
     def to_string(self):
-        """Convert event data to string to be sent on the wire."""
-        event_str = ''
-        if (self._data_str == '') and self._data:
-            self._data_str = ''.join(self._data)
-        event_str += self._type
-        event_str += self._data_str
-        event_str += self._reserved
-        self._len = format(len(event_str) + 2, '02x').upper()
-        self._checksum = self.checksum_generate(self._len + event_str)
-        return self._len + event_str + self._checksum
-
-    def checksum_generate(self, data=False):
+        """Convert event data to string to be sent on the wire.
+
+        The result is cached until type, data or data_str are set again.
+        """
+        line = self._line
+        if line is None:
+            if (self._data_str == '') and self._data:
+                self._data_str = ''.join(self._data)
+                self._dehex = None
+                self._dehex_fake = None
+            line = self.line_format(self._type, self._data_str, self._reserved)
+            self._len = line[:2]
+            self._checksum = line[-2:]
+            self._line = line
+        return line
+
+    @staticmethod
+    def line_format(event_type, data_str='', reserved='00'):
+        """Format event fields into a string to be sent on the wire.
+
+        event_type: Event type (see EVENT_* constants).
+        data_str: Event data (default none).
+        reserved: Reserved data (default '00').
+        """
+        event_str = event_type + data_str + reserved
+        line = '%02X' % (len(event_str) + 2) + event_str
+        return line + Event.checksum_calculate(line)
+
+    def checksum_generate(self, data=None):
         """Generate checksum for event.
 
         data: If set, is used instead of the data in the event object.
         """
-        if data is False:
+        if data is None:
             data = self._len + self._type + self._data_str + self._reserved
-        computed_checksum = 0
-        for data_character in data:
-            computed_checksum += ord(data_character)
-        computed_checksum = computed_checksum % 256
-        computed_checksum = computed_checksum ^ 255
-        computed_checksum += 1
-        return format(computed_checksum, '02x').upper()
+        return self.checksum_calculate(data)
+
+    @staticmethod
+    def checksum_calculate(data):
+        """Calculate checksum of a string (or bytes) of event data.
+
+        The checksum is the two's complement of the sum of all
+        characters, modulo 256.
+        """
+        if isinstance(data, str):
+            data = data.encode('ascii')
+        return '%02X' % (-sum(data) & 0xFF)
 
     def checksum_check(self):
         """Check if calculated checksum matches expected."""
-        calculated = self.checksum_generate()
-        if calculated == self._checksum:
-            return True
-        return False
+        return self.checksum_generate() == self._checksum
 
     def data_dehex(self, fake=False):
         """Convert ASCII hex data into integer data.
@@ -364,13 +453,18 @@ class Event(object):
         values from '0' onwards as offset by ord '0' from 0 (i.e. the
         value ':' is valid, and transates to 10, ';' is 11 ... 'A' is
         17, ...).
+
+        Returns bytes, indexing which gives the integer values. The
+        result is cached, as status reports are decoded once per device.
         """
-        data = []
-        for i in range(0, len(self._data)):
-            data.append(ord(self._data[i]) - ord('0'))
-            if (not fake) and (data[i] > 9):
-                data[i] = data[i] - 7
-        return data
+        if fake:
+            if self._dehex_fake is None:
+                self._dehex_fake = self._data_str.encode(
+                    'ascii', 'replace').translate(_DEHEX_FAKE)
+            return self._dehex_fake
+        if self._dehex is None:
+            self._dehex = self._data_str.encode('ascii', 'replace').translate(_DEHEX)
+        return self._dehex
 
     def data_str_dehex(self, fake=False):
         """Convert ASCII hex data into string data.
@@ -380,12 +474,9 @@ class Event(object):
         value ':' is valid, and transates to 10, ';' is 11 ... 'A' is
         17, ...).
         """
-        data = []
-        for i in range(0, len(self._data)):
-            data.append(str(ord(self._data[i]) - ord('0')))
-            if (not fake) and (ord(data[i]) > 9):
-                data[i] = str(ord(data[i]) - 7)
-        return ''.join(data)
+        if fake:
+            return self._data_str.translate(_DEHEX_STR_FAKE)
+        return self._data_str.translate(_DEHEX_STR)
 
     def delay(self, delay, now_relative=True):
         """Helper to set event time for sending events with a delay.
@@ -397,4 +488,36 @@ class Event(object):
         if now_relative is not True:
             self._time = delay
         else:
-            self._time = time.time() + delay
\ No newline at end of file
+            self._time = _time_now() + delay
+
+
+class EventPool(object):
+    """Free list of Event objects, to reuse rather than reallocate them.
+
+    Only the serial reader thread may acquire(), any thread may release()
+    an event once it is done with it. An event must not be touched after
+    it has been handed off to another thread, as that thread may release
+    it and the next acquire() will reset it.
+    """
+
+    def __init__(self, size=64):
+        """Initialize EventPool object.
+
+        size: Number of free Event objects to keep around (default 64).
+        """
+        self._size = size
+        self._free = [Event() for _ in range(0, size)]
+
+    def acquire(self):
+        """Get a new, empty Event from the pool (or a new one if empty)."""
+        try:
+            event = self._free.pop()
+        except IndexError:
+            return Event()
+        event.reset()
+        return event
+
+    def release(self, event):
+        """Return an Event to the pool once nothing refers to it any more."""
+        if len(self._free) < self._size:
+            self._free.append(event)
@@ -1,18 +1,17 @@
 """Elk Keypad."""
-from collections import namedtuple
-from collections import deque
 import logging
-import time
-import traceback
 
 from ..Const import *
 from ..Node import Node
-from ..Event import Event
 
 _LOGGER = logging.getLogger(__name__)
 
 class Keypad(Node):
     """Represents a Keypad in the Elk."""
+    __slots__ = ('_pressed', '_illum', '_code_bypass', '_temp',
+                 '_temp_enabled', '_last_user_num', '_last_user_at',
+                 '_last_user_name', '_status_report')
+
     PRESSED_NONE = 0
     PRESSED_1 = 1
     PRESSED_2 = 2
@@ -43,37 +42,38 @@ class Keypad(Node):
     PRESSED_F6 = 27
     PRESSED_DATAKEYMODE = 28
 
-    PRESSED_STR = {
-        PRESSED_NONE : 'None',
-        PRESSED_1 : '1',
-        PRESSED_2 : '2',
-        PRESSED_3 : '3',
-        PRESSED_4 : '4',
-        PRESSED_5 : '5',
-        PRESSED_6 : '6',
-        PRESSED_7 : '7',
-        PRESSED_8 : '8',
-        PRESSED_9 : '9',
-        PRESSED_0 : '0',
-        PRESSED_STAR : '*',
-        PRESSED_POUND : '#',
-        PRESSED_F1 : 'F1',
-        PRESSED_F2 : 'F2',
-        PRESSED_F3 : 'F3',
-        PRESSED_F4 : 'F4',
-        PRESSED_STAY : 'Stay',
-        PRESSED_EXIT : 'Exit',
-        PRESSED_CHIME : 'Chime',
-        PRESSED_BYPASS : 'Bypass',
-        PRESSED_ELK : 'Elk',
-        PRESSED_DOWN : 'Down',
-        PRESSED_UP : 'Up',
-        PRESSED_RIGHT : 'Right',
-        PRESSED_LEFT : 'Left',
-        PRESSED_F5 : 'F5',
-        PRESSED_F6 : 'F6',
-        PRESSED_DATAKEYMODE : 'Data Entered'
-    }
+    # Indexed by PRESSED_* value
+    PRESSED_STR = (
+        'None',  # PRESSED_NONE
+        '1',  # PRESSED_1
+        '2',  # PRESSED_2
+        '3',  # PRESSED_3
+        '4',  # PRESSED_4
+        '5',  # PRESSED_5
+        '6',  # PRESSED_6
+        '7',  # PRESSED_7
+        '8',  # PRESSED_8
+        '9',  # PRESSED_9
+        '0',  # PRESSED_0
+        '*',  # PRESSED_STAR
+        '#',  # PRESSED_POUND
+        'F1',  # PRESSED_F1
+        'F2',  # PRESSED_F2
+        'F3',  # PRESSED_F3
+        'F4',  # PRESSED_F4
+        'Stay',  # PRESSED_STAY
+        'Exit',  # PRESSED_EXIT
+        'Chime',  # PRESSED_CHIME
+        'Bypass',  # PRESSED_BYPASS
+        'Elk',  # PRESSED_ELK
+        'Down',  # PRESSED_DOWN
+        'Up',  # PRESSED_UP
+        'Right',  # PRESSED_RIGHT
+        'Left',  # PRESSED_LEFT
+        'F5',  # PRESSED_F5
+        'F6',  # PRESSED_F6
+        'Data Entered'  # PRESSED_DATAKEYMODE
+    )
 
     def __init__(self, pyelk=None, number=None):
         """Initializes Keypad object.
@@ -85,13 +85,15 @@ class Keypad(Node):
         super().__init__('Keypad', pyelk, number)
         # Initialize Keypad specific things
         self._pressed = 0
-        self._illum = [0, 0, 0, 0, 0, 0]
+        self._illum = bytearray(6)
         self._code_bypass = False
         self._temp = -460
         self._temp_enabled = False
         self._last_user_num = -1
         self._last_user_at = 0
         self._last_user_name = 'N/A'
+        # Last EVENT_KEYPAD_STATUS_REPORT data, to skip repeated reports
+        self._status_report = None
 
     def state_save(self):
         """Returns a save state object for fast load functionality."""
@@ -111,7 +113,7 @@ class Keypad(Node):
                 self._last_user_num = state['last_user_num']
             elif state_key == 'last_user_at':
                 self._last_user_at = state['last_user_at']
-            elif state_key == 'last_user_at':
+            elif state_key == 'last_user_name':
                 self._last_user_name = state['last_user_name']
             elif state_key == 'temp_enabled':
                 self._temp_enabled = state['temp_enabled']
@@ -120,6 +122,15 @@ class Keypad(Node):
         if self._area is not None and self._area > 0:
             self._pyelk.AREAS[self._area_index].member_keypad[self._index] = True
 
+    @property
+    def pressed(self):
+        """Returns the last key pressed (see PRESSED_* constants)."""
+        return self._pressed
+
+    def pressed_pretty(self):
+        """Keypad's last key pressed as text string."""
+        return self.PRESSED_STR[self._pressed]
+
     @property
     def temp(self):
         """Returns the current temperature."""
@@ -156,17 +167,35 @@ class Keypad(Node):
         D[16]: 16 byte ASCII character array of area assignments, where
         '0' is no area assigned, '1' is assigned to Area 1, etc
         """
-        area = event.data_dehex(True)[self._index]
+        event_time = event.time
+        area_index = self._update_area(event.data_dehex(True)[self._index], event_time)
+        # Not assigned to an area (area 0, index -1)
+        if area_index >= 0:
+            self._pyelk.AREAS[area_index]._updated_at = event_time
+            self._pyelk.AREAS[area_index]._callback()
+
+    def _update_area(self, area, updated_at):
+        """Set area decoded from EVENT_KEYPAD_AREA_REPLY.
+
+        Returns the index of the Area whose membership was updated, the
+        caller is responsible for triggering that Area's callback.
+        """
+        areas = self._pyelk.AREAS
+        index = self._index
+        if self._area is None:
+            # First report, clear membership in every area
+            for node_index in range(0, AREA_MAX_COUNT):
+                areas[node_index].member_keypad[index] = False
+        elif (area != self._area) and (self._area > 0):
+            # Only the previously assigned area can have us as a member
+            areas[self._area_index].member_keypad[index] = False
         self._area = area
         self._area_index = self._area - 1
-        for node_index in range(0, AREA_MAX_COUNT):
-            self._pyelk.AREAS[node_index].member_keypad[self._index] = False
         if self._area > 0:
-            self._pyelk.AREAS[self._area_index].member_keypad[self._index] = True
-        self._updated_at = event.time
+            areas[self._area_index].member_keypad[index] = True
+        self._updated_at = updated_at
         self._callback()
-        self._pyelk.AREAS[self._area_index]._updated_at = event.time
-        self._pyelk.AREAS[self._area_index]._callback()
+        return self._area_index
 
     def unpack_event_keypad_status_report(self, event):
         """Unpack EVENT_KEYPAD_STATUS_REPORT.
@@ -179,20 +208,25 @@ class Keypad(Node):
         C: If '1', code required to bypass
         P[8]: Beep and chime mode per Area (See Area constants)
         """
-        keypad_number = int(event.data_str[0:2])
-        key_pressed = int(event.data_str[2:4])
-        if key_pressed != self._pressed:
-            self._pressed = key_pressed
-        for i in range(0, 6):
-            self._illum[i] = event.data_dehex()[4+i]
-        if event.data[10] == '1':
-            self._code_bypass = True
-        else:
-            self._code_bypass = False
+        data_str = event.data_str
         # Chime is actually by area, not keypad, even though
-        # it is returned from the keypad status report.
+        # it is returned from the keypad status report. Another keypad
+        # may have reported since, so always apply it.
+        chime = event.data_dehex(True)
+        areas = self._pyelk.AREAS
         for node_index in range(0, AREA_MAX_COUNT):
-            self._pyelk.AREAS[node_index].chime_mode = event.data_dehex(True)[11+node_index]
+            areas[node_index].chime_mode = chime[11+node_index]
+        if (data_str == self._status_report) and (data_str[2:4] == '00'):
+            # Nothing changed for this keypad since the last report. Reports
+            # with a key press are always passed on, the same key may have
+            # been pressed again.
+            return
+        self._status_report = data_str
+        key_pressed = int(data_str[2:4])
+        if key_pressed != self._pressed:
+            self._pressed = key_pressed
+        self._illum[0:6] = event.data_dehex()[4:10]
+        self._code_bypass = (data_str[10] == '1')
         self._updated_at = event.time
         self._callback()
 
@@ -228,23 +262,24 @@ class Keypad(Node):
         # failed_code = event.data_str[0:12]
         user = int(event.data_str[12:15])
         user = user - 1
-        # keypad_number = int(event.data_str[15:17])
         if user < 0:
             # Invalid code was entered
             self._last_user_name = 'Invalid'
         else:
             # Valid user code was entered
             self._last_user_name = self._pyelk.USERS[user].description
+        event_time = event.time
         self._last_user_num = user
-        self._last_user_at = event.time
-        if self._area > 0:
-            self._pyelk.AREAS[self._area_index].last_user_num = user
-            self._pyelk.AREAS[self._area_index].last_user_at = event.time
-            self._pyelk.AREAS[self._area_index].last_user_name = self._last_user_name
-            self._pyelk.AREAS[self._area_index].last_keypad_num = self._number
-            self._pyelk.AREAS[self._area_index].last_keypad_name = self._description
+        self._last_user_at = event_time
+        if self._area is not None and self._area > 0:
+            area = self._pyelk.AREAS[self._area_index]
+            area.last_user_num = user
+            area.last_user_at = event_time
+            area.last_user_name = self._last_user_name
+            area.last_keypad_num = self._number
+            area.last_keypad_name = self._description
             # Force area update to propogate the last user code / at update
-            self._pyelk.AREAS[self._area_index].updated_at = event.time
-            self._pyelk.AREAS[self._area_index].callback_trigger()
-        self._updated_at = event.time
+            area.updated_at = event_time
+            area.callback_trigger()
+        self._updated_at = event_time
         self._callback()
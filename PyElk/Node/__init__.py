@@ -1,15 +1,17 @@
 """Elk Node."""
-from collections import namedtuple
-from collections import deque
 from inspect import signature
 import logging
 import time
-import traceback
 
 _LOGGER = logging.getLogger(__name__)
 
 class Node(object):
     """Base object for other Elk object types."""
+    __slots__ = ('_classname', '_area', '_area_index', '_index', '_number',
+                 '_enabled', '_included', '_status', '_description',
+                 '_updated_at', '_update_callbacks', '_pyelk',
+                 '_description_defaults')
+
     STATUS_STR = {}
 
     def __init__(self, classname=None, pyelk=None, number=0):
@@ -38,10 +40,12 @@ class Node(object):
         self._description = None
         # Time object was last updated at
         self._updated_at = 0
-        # Callback methods for updates
+        # Callback methods for updates, as (method, parameter count)
         self._update_callbacks = []
         # Pyelk.Elk object that this object is for
         self._pyelk = pyelk
+        # (prefix, pretty default, default descriptions) for description_pretty
+        self._description_defaults = None
 
     def state_save(self):
         """Returns a save state object for fast load functionality."""
@@ -96,6 +100,7 @@ class Node(object):
         if isinstance(value, int):
             self._number = value
             self._index = self._number - 1
+            self._description_defaults = None
 
     @property
     def enabled(self):
@@ -152,13 +157,18 @@ class Node(object):
 
     def callback_add(self, method):
         """Add a method to list of callbacks to be called on update."""
-        if method not in self._update_callbacks:
-            self._update_callbacks.append(method)
+        for callback, _ in self._update_callbacks:
+            if callback == method:
+                return
+        # Inspecting the signature is slow, so only do it once
+        self._update_callbacks.append((method, len(signature(method).parameters)))
 
     def callback_remove(self, method):
         """Remove a method from list of callbacks to be called on update."""
-        if method in self._update_callbacks:
-            self._update_callbacks.remove(method)
+        for entry in self._update_callbacks:
+            if entry[0] == method:
+                self._update_callbacks.remove(entry)
+                return
 
     def age(self):
         """Age of the current object state (time since last update)."""
@@ -175,33 +185,41 @@ class Node(object):
 
         prefix: Prefix to compare against / auto-generate with.
         """
-        if (self._description is None) or (self._description == '') \
-        or (self._description == prefix.strip() + format(self._number, '02')) \
-        or (self._description == prefix.strip() + format(self._number, '03')) \
-        or (self._description == prefix + format(self._number, '02')) \
-        or (self._description == prefix + format(self._number, '03')):
+        defaults = self._description_defaults
+        if (defaults is None) or (defaults[0] != prefix):
+            # Only depends on prefix and number, so build it once
+            stripped = prefix.strip()
+            defaults = (prefix, prefix + str(self._number), frozenset((
+                '',
+                stripped + format(self._number, '02'),
+                stripped + format(self._number, '03'),
+                prefix + format(self._number, '02'),
+                prefix + format(self._number, '03'))))
+            self._description_defaults = defaults
+        if (self._description is None) or (self._description in defaults[2]):
             # If no description set, or it's the default (with zero
             # padding to 2 or 3 digits) return a nicer default.
-            return prefix + str(self._number)
+            return defaults[1]
         return self._description
 
     def _callback(self, data=None):
         """Perform update callback, if possible."""
+        callbacks = self._update_callbacks
         if data is None:
             data = self
-        for callback in self._update_callbacks:
-            sig = signature(callback)
-            if len(sig.parameters) == 0:
+        if not callbacks:
+            # If there are no callbacks to be made, make a call upwards
+            # We may have new devices that need to be handled
+            if self._pyelk is not None:
+                self._pyelk.promoted_callback(self, data)
+            return
+        for callback, parameters in callbacks:
+            if parameters == 0:
                 callback()
-            if len(sig.parameters) == 1:
+            elif parameters == 1:
                 callback(data)
-            if len(sig.parameters) == 2:
+            elif parameters == 2:
                 callback(self, data)
-        # If there were no callbacks to be made, make a call upwards
-        # We may have new devices that need to be handled
-        if len(self._update_callbacks) == 0 and self._pyelk is not None:
-            #_LOGGER.debug('_callback - promoting callback')
-            self._pyelk.promoted_callback(self, data)
 
     def callback_trigger(self, data=None):
         """Trigger a callback."""
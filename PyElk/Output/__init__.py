@@ -1,9 +1,5 @@
 """Elk Output."""
-from collections import namedtuple
-from collections import deque
 import logging
-import time
-import traceback
 
 from ..Const import *
 from ..Node import Node
@@ -13,14 +9,17 @@ _LOGGER = logging.getLogger(__name__)
 
 class Output(Node):
     """Represents an Output in the Elk."""
+    # Everything an Output needs is already in Node's slots
+    __slots__ = ()
 
     STATUS_OFF = 0
     STATUS_ON = 1
 
-    STATUS_STR = {
-        STATUS_OFF : 'Off',
-        STATUS_ON : 'On'
-    }
+    # Indexed by STATUS_* value
+    STATUS_STR = (
+        'Off',  # STATUS_OFF
+        'On'  # STATUS_ON
+    )
 
     def __init__(self, pyelk=None, number=None):
         """Initializes Output object.
@@ -50,11 +49,8 @@ class Output(Node):
         """
         event = Event()
         event.type = Event.EVENT_OUTPUT_ON
-        if duration < 0:
-            duration = 0
-        elif duration > 65535:
-            duration = 65535
-        event.data_str = format(self._number, '03') + format(duration, '05')
+        duration = max(0, min(65535, duration))
+        event.data_str = '%03d%05d' % (self._number, duration)
         self._pyelk.elk_event_send(event)
 
     def turn_off(self):
@@ -67,7 +63,7 @@ class Output(Node):
         """
         event = Event()
         event.type = Event.EVENT_OUTPUT_OFF
-        event.data_str = format(self._number, '03')
+        event.data_str = '%03d' % self._number
         self._pyelk.elk_event_send(event)
 
     def toggle(self):
@@ -80,7 +76,7 @@ class Output(Node):
         """
         event = Event()
         event.type = Event.EVENT_OUTPUT_TOGGLE
-        event.data_str = format(self._number, '03')
+        event.data_str = '%03d' % self._number
         self._pyelk.elk_event_send(event)
 
 
@@ -96,11 +92,14 @@ class Output(Node):
         D[208]: 208 byte ASCII array of output status,
         '0' is off, '1' is on
         """
-        data = event.data_dehex()[self._index]
-        if self._status == data:
+        self._update_status(event.data_dehex()[self._index], event.time)
+
+    def _update_status(self, status, updated_at):
+        """Set status decoded from EVENT_OUTPUT_STATUS_REPORT."""
+        if self._status == status:
             return
-        self._status = data
-        self._updated_at = event.time
+        self._status = status
+        self._updated_at = updated_at
         self._callback()
 
     def unpack_event_output_update(self, event):
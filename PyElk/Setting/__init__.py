@@ -1,9 +1,8 @@
 """Elk Setting."""
-from collections import namedtuple
-from collections import deque
+import datetime
 import logging
-import time
-import traceback
+
+from dateutil import parser
 
 from ..Const import *
 from ..Node import Node
@@ -13,16 +12,18 @@ _LOGGER = logging.getLogger(__name__)
 
 class Setting(Node):
     """Represents a Setting in the Elk."""
+    __slots__ = ('_format',)
 
     FORMAT_NUMBER = 0
     FORMAT_TIMER = 1
     FORMAT_TIME_OF_DAY = 2
 
-    FORMAT_STR = {
-        FORMAT_NUMBER : 'Number',
-        FORMAT_TIMER : 'Timer',
-        FORMAT_TIME_OF_DAY : 'Time of Day',
-    }
+    # Indexed by FORMAT_* value
+    FORMAT_STR = (
+        'Number',  # FORMAT_NUMBER
+        'Timer',  # FORMAT_TIMER
+        'Time of Day',  # FORMAT_TIME_OF_DAY
+    )
 
     def __init__(self, pyelk=None, number=None):
         """Initializes Value object.
@@ -90,16 +91,12 @@ class Setting(Node):
         if self._format == self.FORMAT_NUMBER or self._format == self.FORMAT_TIMER:
             raw_value = value
         elif self._format == self.FORMAT_TIME_OF_DAY:
-            import datetime
-            import dateutil.parser as parser
-            tod = None
-            if isinstance(value, datetime):
+            if isinstance(value, (datetime.datetime, datetime.time)):
                 tod = value
             else:
                 tod = parser.parse(value)
-            tod_hour = tod.hour
-            tod_minute = tod.minute
-            raw_value = int(format(tod_hour, '02x') + format(tod_minute, '02x'), 16)
+            # Packed as hour in the high byte, minute in the low byte
+            raw_value = (tod.hour << 8) | tod.minute
         event = Event()
         event.type = Event.EVENT_VALUE_WRITE
         event.data_str = format(self._number, '02') + format(raw_value, '05')
@@ -114,7 +111,8 @@ class Setting(Node):
         F: Custom setting format (0: Number, 1: Timer, 2: Time of day)
         [...]: If NN is 0, repeat DDDDDF another 19 times for all custom settings
         """
-        index = int(event.data_str[0:1])
+        data_str = event.data_str
+        index = int(data_str[0:2])
         offset = None
         data = ''
         if index == 0:
@@ -123,17 +121,15 @@ class Setting(Node):
         else:
             # only a single result
             offset = 2
-        raw_data = int(event.data_str[offset:offset+5])
-        data_format = int(event.data_str[offset+5])
+        raw_data = int(data_str[offset:offset+5])
+        data_format = int(data_str[offset+5])
         if data_format == self.FORMAT_NUMBER:
             data = raw_data
         elif data_format == self.FORMAT_TIMER:
             data = raw_data
         elif data_format == self.FORMAT_TIME_OF_DAY:
-            raw_data = format(raw_data, '04x')
-            tod_hour = int(raw_data[0:2])
-            tod_minute = int(raw_data[2:4])
-            data = format(tod_hour, '02') + ':' + format(tod_minute, '02')
+            # Packed as hour in the high byte, minute in the low byte
+            data = '%02d:%02d' % (raw_data >> 8, raw_data & 0xFF)
         if self._status == data:
             return
         else:
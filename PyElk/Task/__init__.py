@@ -1,9 +1,6 @@
 """Elk Task."""
-from collections import namedtuple
-from collections import deque
 import logging
 import time
-import traceback
 
 from ..Const import *
 from ..Node import Node
@@ -13,13 +10,16 @@ _LOGGER = logging.getLogger(__name__)
 
 class Task(Node):
     """Represents a Task in the Elk."""
+    __slots__ = ('_last_activated', '_off_timer')
+
     STATUS_OFF = 0
     STATUS_ON = 1
 
-    STATUS_STR = {
-        STATUS_OFF : 'Off',
-        STATUS_ON : 'On'
-    }
+    # Indexed by STATUS_* value
+    STATUS_STR = (
+        'Off',  # STATUS_OFF
+        'On'  # STATUS_ON
+    )
 
     def __init__(self, pyelk=None, number=None):
         """Initializes Task object.
@@ -32,6 +32,8 @@ class Task(Node):
         # Initialize Task specific things
         self._status = self.STATUS_OFF
         self._last_activated = 0
+        # Pending timer that turns status back off after activation
+        self._off_timer = None
 
     def state_save(self):
         """Returns a save state object for fast load functionality."""
@@ -63,7 +65,7 @@ class Task(Node):
         """
         event = Event()
         event.type = Event.EVENT_TASK_ACTIVATE
-        event.data_str = format(self._number, '03')
+        event.data_str = '%03d' % self._number
         self._pyelk.elk_event_send(event)
 
     def turn_off(self):
@@ -84,17 +86,27 @@ class Task(Node):
         Event data format: RRR0
         RRR: Task number that was activated (1 to 32, left zero padded to 3 digits)
         0: Reserved for future use
+
+        Every report is an activation, so status goes on and then back
+        off a second later (without holding up other events). The off
+        callback is made by the event processing like any other.
         """
-        data = int(event.data_str[0:3])
-        if self._status == data:
-            return
-        # We set to off because it's a momentary event, but update the time so
-        # things can be triggered from the last_activated
+        event_time = event.time
         self._status = self.STATUS_ON
-        self._updated_at = event.time
-        self._last_activated = event.time
+        self._updated_at = event_time
+        self._last_activated = event_time
         self._callback()
-        time.sleep(1)
+        # A new activation supersedes a pending off
+        if self._off_timer is not None:
+            self._off_timer.cancel()
+        self._off_timer = self._pyelk._call_later(1.0, self._deferred_off, event_time)
+
+    def _deferred_off(self, activated_at):
+        """Set status back to off after a momentary activation."""
+        if activated_at != self._last_activated:
+            # Timer for an earlier activation that fired anyway
+            return
+        self._off_timer = None
         self._status = self.STATUS_OFF
-        self._updated_at = event.time
+        self._updated_at = activated_at
         self._callback()
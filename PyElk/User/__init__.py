@@ -1,13 +1,8 @@
 """Elk User."""
-from collections import namedtuple
-from collections import deque
 import logging
-import time
-import traceback
 
 from ..Const import *
 from ..Node import Node
-from ..Event import Event
 
 _LOGGER = logging.getLogger(__name__)
 
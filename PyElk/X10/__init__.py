@@ -1,9 +1,5 @@
 """Elk X10."""
-from collections import namedtuple
-from collections import deque
 import logging
-import time
-import traceback
 import re
 
 from ..Const import *
@@ -67,6 +63,11 @@ class X10(Node):
         HOUSE_P : 'P'
         }
 
+    # House / unit code as sent by the Elk ('A01' to 'P16') to device index
+    HOUSECODE_INDEX = dict(
+        ('%s%02d' % (chr(ord('A') + house), unit + 1), (house * 16) + unit)
+        for house in range(0, 16) for unit in range(0, 16))
+
     STATUS_OFF = 0
     STATUS_ON = 1
     STATUS_DIMMED = 2
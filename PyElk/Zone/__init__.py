@@ -1,13 +1,8 @@
 """Elk Zone."""
-from collections import namedtuple
-from collections import deque
 import logging
-import time
-import traceback
 
 from ..Const import *
 from ..Node import Node
-from ..Event import Event
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -304,12 +299,15 @@ class Zone(Node):
         Event data format: Z[208]
         Z[208]: Array of 208 bytes showing alarm by zone
         """
-        data = event.data_dehex(True)[self._index]
-        if self._alarm == data:
+        self._update_alarm(event.data_dehex(True)[self._index], event.time)
+
+    def _update_alarm(self, alarm, updated_at):
+        """Set alarm state decoded from EVENT_ALARM_ZONE_REPORT."""
+        if self._alarm == alarm:
             return
-        self._alarm = data
+        self._alarm = alarm
         self._check_enabled()
-        self._updated_at = event.time
+        self._updated_at = updated_at
         self._callback()
 
     def unpack_event_zone_definition(self, event):
@@ -0,0 +1,104 @@
+"""Helpers shared by the PyElk tests."""
+from collections import deque
+from unittest import mock
+
+from PyElk.Elk import Elk, Scanner
+from PyElk.Event import Event
+
+
+def packet(event_type, data_str=''):
+    """Return an Elk packet line for event_type and data_str."""
+    event = Event()
+    event.type = event_type
+    event.data_str = data_str
+    return event.to_string()
+
+
+class FakeOutput(object):
+    """Stand in for SerialOutputHandler, sends queued events straight away."""
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def resume(self):
+        """Send everything queued to the fake panel."""
+        queue = self._connection._queue
+        while queue:
+            self._connection.send(queue.popleft())
+
+    def stop(self):
+        """Nothing to stop."""
+        pass
+
+
+class FakeConnection(object):
+    """Stand in for Connection, records sent events.
+
+    responder: If set, called with each sent Event and returns a list of
+    packet lines the fake panel replies with.
+    """
+
+    def __init__(self, pyelk, responder=None):
+        self._pyelk = pyelk
+        self._responder = responder
+        self._elkrp_connected = False
+        self._queue = deque()
+        self._connection_output = FakeOutput(self)
+        self.sent = []
+        pyelk._queue_outgoing_elk_events = self._queue
+        pyelk._connection = self
+
+    def send(self, event):
+        """Send event to the fake panel."""
+        self.sent.append(event.to_string())
+        if self._responder is not None:
+            for line in self._responder(event):
+                self._pyelk.elk_event_enqueue(line)
+
+    def close(self):
+        """Nothing to close."""
+        pass
+
+
+class IdleScanner(object):
+    """Stand in for Scanner that never scans, so no rescan is in progress."""
+
+    def __init__(self, pyelk):
+        self._state = Scanner.STATE_SCAN_IDLE
+
+    @property
+    def state(self):
+        """Return scanner state, always idle."""
+        return self._state
+
+    def stop(self):
+        """Nothing to stop."""
+        pass
+
+    def pause(self):
+        """Nothing to pause."""
+        pass
+
+    def resume(self):
+        """Never starts scanning."""
+        pass
+
+    def close(self):
+        """Nothing to close."""
+        pass
+
+    def is_alive(self):
+        """Always ready to (not) scan."""
+        return True
+
+
+def make_elk(config=None, responder=None):
+    """Return a synchronous Elk with a FakeConnection and no rescan thread."""
+    elk_config = {'host': 'fake', 'fastload': False, 'synchronous': True}
+    if config is not None:
+        elk_config.update(config)
+    # Tests drive scanning themselves
+    with mock.patch('PyElk.Elk.Scanner', IdleScanner):
+        elk = Elk(elk_config)
+    FakeConnection(elk, responder)
+    return elk
@@ -0,0 +1,126 @@
+"""Tests for sending while disconnected, reconnecting and stopping."""
+import threading
+import time
+import unittest
+
+from PyElk.Connection import Connection, SerialOutputHandler
+from PyElk.Elk import Scanner
+from PyElk.Event import Event
+
+from .common import FakeConnection, make_elk, packet
+
+
+class DisconnectedTest(unittest.TestCase):
+
+    def setUp(self):
+        self.elk = make_elk()
+
+    def test_send_after_stop(self):
+        self.elk.stop()
+        self.assertIsNone(self.elk._connection)
+        self.elk.OUTPUTS[0].turn_on()
+        self.elk.elk_event_request(Event.EVENT_ARMING_STATUS)
+        self.elk.elk_event_send_actual(Event())
+
+    def test_send_after_failed_connect(self):
+        # What _connect leaves behind when the connection can't be made
+        self.elk._connection = Connection()
+        queue = self.elk._queue_outgoing_elk_events
+        self.elk.OUTPUTS[0].turn_on()
+        self.assertFalse(queue)
+        self.elk.elk_event_send_actual(Event())
+
+
+class ReconnectTest(unittest.TestCase):
+
+    def setUp(self):
+        self.errors = []
+        self._excepthook = threading.excepthook
+        threading.excepthook = lambda args: self.errors.append(args.exc_value)
+
+    def tearDown(self):
+        threading.excepthook = self._excepthook
+
+    def test_stop_during_rescan_after_reconnect(self):
+        elk = make_elk()
+        elk._rescan_thread = Scanner(elk)
+        scanning = threading.Event()
+
+        def responder(event):
+            scanning.set()
+            return []
+
+        def fake_connect():
+            FakeConnection(elk, responder)
+            elk._status = elk.STATE_RUNNING
+
+        # Lose the connection, the reconnect starts a rescan
+        elk._connection = None
+        elk._connect = fake_connect
+        elk._schedule_reconnect()
+        self.assertTrue(scanning.wait(5))
+        self.assertTrue(elk._rescan_in_progress)
+        elk.stop()
+        self.assertFalse(elk._rescan_thread.is_alive())
+        self.assertFalse(elk._reconnect_thread.is_alive())
+        self.assertIsNone(elk._connection)
+        self.assertEqual(self.errors, [])
+
+    def test_stop_during_backoff(self):
+        elk = make_elk()
+        connects = []
+        elk._connect = lambda: connects.append(True)
+        elk._connection = None
+        elk._schedule_reconnect()
+        elk.stop()
+        self.assertFalse(elk._reconnect_thread.is_alive())
+        self.assertEqual(connects, [])
+
+
+
+class OutputRetryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.elk = make_elk()
+        self.sent = []
+        self.elk.elk_event_send_actual = self._send
+        self.reply = None
+        self.output = SerialOutputHandler(ratelimit=100)
+        self.output.set_pyelk(self.elk)
+
+    def tearDown(self):
+        self.output.close()
+
+    def _send(self, event):
+        self.sent.append(event.to_string())
+        if self.reply is not None:
+            # The reply arrives on the reader thread while we are sending
+            reader = threading.Thread(target=self.elk.elk_event_enqueue, args=(self.reply,))
+            reader.start()
+            reader.join(0.1)
+
+    def _request(self):
+        event = Event()
+        event.type = Event.EVENT_THERMOSTAT_DATA_REQUEST
+        event.data_str = '01'
+        event.expect = '01'
+        event.retries = 3
+        event.retry_delay = 0.05
+        self.elk._queue_outgoing_elk_events.append(event)
+        self.output.resume()
+
+    def test_retries_without_reply(self):
+        self._request()
+        time.sleep(0.5)
+        self.assertEqual(len(self.sent), 4)
+
+    def test_reply_during_send_cancels_retries(self):
+        self.reply = packet(Event.EVENT_THERMOSTAT_DATA_REPLY, '0100000000000')
+        self._request()
+        time.sleep(0.5)
+        self.assertEqual(len(self.sent), 1)
+        self.assertFalse(self.elk._queue_outgoing_elk_events)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+"""Tests for dispatching incoming events to the devices they update."""
+import threading
+import unittest
+
+from PyElk.Area import Area
+from PyElk.Event import Event
+from PyElk.X10 import X10
+from PyElk.Zone import Zone
+
+from .common import make_elk, packet
+
+
+class DispatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.elk = make_elk()
+        self.calls = []
+
+    def _watch(self, devices):
+        for device in devices:
+            device.callback_add(lambda node: self.calls.append((node.classname, node.number)))
+
+    def _enqueue(self, event_type, data_str):
+        self.elk.elk_event_enqueue(packet(event_type, data_str))
+
+    def test_zone_update(self):
+        self._watch(self.elk.ZONES)
+        self._enqueue(Event.EVENT_ZONE_UPDATE, '0059')
+        zone = self.elk.ZONES[4]
+        self.assertEqual(zone.state, Zone.STATE_OPEN)
+        self.assertEqual(zone.status, Zone.STATUS_VIOLATED)
+        self.assertEqual(self.calls, [('Zone', 5)])
+        # Unchanged status is not passed on again
+        self._enqueue(Event.EVENT_ZONE_UPDATE, '0059')
+        self.assertEqual(self.calls, [('Zone', 5)])
+
+    def test_zone_update_bad_number_skipped(self):
+        self._watch(self.elk.ZONES)
+        self._enqueue(Event.EVENT_ZONE_UPDATE, '0x59')
+        self.assertEqual(self.calls, [])
+        self.assertFalse(self.elk._queue_incoming_elk_events)
+        # Still processing events afterwards
+        self._enqueue(Event.EVENT_ZONE_UPDATE, '0059')
+        self.assertEqual(self.calls, [('Zone', 5)])
+
+    def test_output_status_report(self):
+        self._watch(self.elk.OUTPUTS)
+        self._enqueue(Event.EVENT_OUTPUT_STATUS_REPORT, '1' + '0'*206 + '1')
+        self.assertEqual(self.elk.OUTPUTS[0].status, 1)
+        self.assertEqual(self.elk.OUTPUTS[1].status, 0)
+        self.assertEqual(self.elk.OUTPUTS[207].status, 1)
+        changed = [call for call in self.calls if call[1] in (1, 208)]
+        self.assertEqual(changed, [('Output', 1), ('Output', 208)])
+        # Only outputs whose status changed are called back
+        del self.calls[:]
+        self._enqueue(Event.EVENT_OUTPUT_STATUS_REPORT, '0' + '0'*206 + '1')
+        self.assertEqual(self.calls, [('Output', 1)])
+
+    def test_output_update(self):
+        self._watch(self.elk.OUTPUTS)
+        self._enqueue(Event.EVENT_OUTPUT_UPDATE, '0031')
+        self.assertEqual(self.elk.OUTPUTS[2].status, 1)
+        self.assertEqual(self.calls, [('Output', 3)])
+
+    def test_keypad_area_reply(self):
+        self._watch(self.elk.AREAS)
+        self._enqueue(Event.EVENT_KEYPAD_AREA_REPLY, '1122000000000000')
+        self.assertEqual(self.elk.KEYPADS[0].area, 1)
+        self.assertEqual(self.elk.KEYPADS[2].area, 2)
+        self.assertEqual(self.elk.AREAS[0].member_keypad[0:4], [True, True, False, False])
+        self.assertEqual(self.elk.AREAS[1].member_keypad[0:4], [False, False, True, True])
+        # Each area once, and none for the keypads in area 0
+        self.assertEqual(self.calls, [('Area', 1), ('Area', 2)])
+
+    def test_keypad_area_reply_unassigned(self):
+        """Keypad.unpack_event_keypad_area_reply, for a keypad in area 0."""
+        self._watch(self.elk.AREAS)
+        event = Event()
+        event.parse(packet(Event.EVENT_KEYPAD_AREA_REPLY, '1022000000000000'))
+        self.elk.KEYPADS[1].unpack_event_keypad_area_reply(event)
+        self.assertEqual(self.elk.KEYPADS[1].area, 0)
+        self.assertEqual(self.calls, [])
+        self.assertEqual(self.elk.AREAS[7].updated_at, 0)
+        self.elk.KEYPADS[2].unpack_event_keypad_area_reply(event)
+        self.assertEqual(self.calls, [('Area', 2)])
+
+    def test_keypad_status_report(self):
+        self._watch(self.elk.KEYPADS)
+        self._enqueue(Event.EVENT_KEYPAD_STATUS_REPORT, '0105012000100000000')
+        keypad = self.elk.KEYPADS[0]
+        self.assertEqual(keypad.pressed, 5)
+        self.assertEqual(list(keypad._illum), [0, 1, 2, 0, 0, 0])
+        self.assertTrue(keypad._code_bypass)
+        self.assertEqual(self.calls, [('Keypad', 1)])
+
+    def test_arming_status_report(self):
+        self._watch(self.elk.AREAS)
+        self._enqueue(Event.EVENT_ARMING_STATUS_REPORT, '100000001000000000000000')
+        area = self.elk.AREAS[0]
+        self.assertEqual(area.status, Area.STATUS_ARMED_AWAY)
+        self.assertEqual(area.arm_up, Area.ARM_UP_READY)
+        self.assertEqual(self.calls[0], ('Area', 1))
+
+    def test_alarm_zone_report(self):
+        self._enqueue(Event.EVENT_ALARM_ZONE_REPORT, '2' + '0'*206 + '3')
+        self.assertEqual(self.elk.ZONES[0].alarm, Zone.ALARM_BURGLAR_2)
+        self.assertEqual(self.elk.ZONES[1].alarm, Zone.ALARM_DISABLED)
+        self.assertEqual(self.elk.ZONES[207].alarm, Zone.ALARM_BURGLAR_PERIMETER_INSTANT)
+
+    def test_plc_change_update(self):
+        self._watch(self.elk.X10)
+        self._enqueue(Event.EVENT_PLC_CHANGE_UPDATE, 'B0301')
+        light = self.elk.X10[X10.HOUSECODE_INDEX['B03']]
+        self.assertEqual(light.status, X10.STATUS_ON)
+        self.assertEqual(self.calls, [('X10', 19)])
+        # Unit code 00 is an All command, not a device
+        del self.calls[:]
+        self._enqueue(Event.EVENT_PLC_CHANGE_UPDATE, 'B0001')
+        self.assertEqual(self.calls, [])
+
+    def test_task_update(self):
+        task = self.elk.TASKS[2]
+        self._watch([task])
+        self._enqueue(Event.EVENT_TASK_UPDATE, '0030')
+        self.assertEqual(task.status, task.STATUS_ON)
+        self.assertEqual(self.calls, [('Task', 3)])
+        # Turning back off is left to the event processing
+        task._off_timer.cancel()
+        self.elk._call_later_due(task._deferred_off, (task.last_activated,))
+        self.assertEqual(task.status, task.STATUS_OFF)
+        self.assertEqual(self.calls, [('Task', 3), ('Task', 3)])
+
+    def test_value_read_reply(self):
+        self._watch(self.elk.SETTINGS)
+        self._enqueue(Event.EVENT_VALUE_READ_REPLY, '0200123000')
+        self.assertEqual(self.elk.SETTINGS[1].status, 123)
+        self.assertEqual(self.calls, [('Setting', 2)])
+
+    def test_version_reply(self):
+        self._enqueue(Event.EVENT_VERSION_REPLY, '050203010402' + '0'*36)
+        self.assertEqual(self.elk.get_version(),
+                         {'Elk M1' : '05.02.03', 'M1XEP' : '01.04.02'})
+
+
+
+class ConsumerThreadTest(unittest.TestCase):
+    """Default (not synchronous) processing on the consumer thread."""
+
+    def setUp(self):
+        self.elk = make_elk({'synchronous': False})
+
+    def tearDown(self):
+        self.elk.stop()
+
+    def test_handled_on_consumer_thread(self):
+        handled = threading.Event()
+        threads = []
+
+        def callback(node):
+            threads.append(threading.current_thread())
+            handled.set()
+
+        self.elk.ZONES[4].callback_add(callback)
+        self.elk.elk_event_enqueue(packet(Event.EVENT_ZONE_UPDATE, '0059'))
+        self.assertTrue(handled.wait(5))
+        self.assertEqual(self.elk.ZONES[4].status, Zone.STATUS_VIOLATED)
+        self.assertEqual(threads, [self.elk._consumer_thread])
+
+    def test_stop_ends_consumer_thread(self):
+        consumer_thread = self.elk._consumer_thread
+        self.assertTrue(consumer_thread.is_alive())
+        self.elk.stop()
+        self.assertFalse(consumer_thread.is_alive())
+        # And connect() starts it again
+        self.elk._connect = lambda: None
+        self.elk.connect()
+        self.assertTrue(self.elk._consumer_thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""Tests for Elk.elk_event_enqueue and the Event pool."""
+from collections import deque
+import threading
+import time
+import unittest
+
+from PyElk.Event import Event, EventPool
+
+from .common import make_elk, packet
+
+
+class PublishCheckDeque(deque):
+    """Incoming deque that records the outgoing queue when an event is added."""
+
+    def __init__(self, elk):
+        super().__init__()
+        self._elk = elk
+        self.outgoing_at_publish = []
+
+    def append(self, event):
+        self.outgoing_at_publish.append(list(self._elk._queue_outgoing_elk_events))
+        super().append(event)
+
+
+class PublishCheckCondition(threading.Condition):
+    """Condition that records the outgoing queue when waiters are notified."""
+
+    def __init__(self, elk):
+        super().__init__()
+        self._elk = elk
+        self.outgoing_at_publish = []
+
+    def notify_all(self):
+        self.outgoing_at_publish.append(list(self._elk._queue_outgoing_elk_events))
+        super().notify_all()
+
+
+class EnqueueTest(unittest.TestCase):
+
+    def setUp(self):
+        self.elk = make_elk()
+
+    def _retry_event(self, expect):
+        event = Event()
+        event.type = Event.EVENT_THERMOSTAT_DATA_REQUEST
+        event.data_str = '01'
+        event.expect = expect
+        event.retries = 3
+        self.elk._queue_outgoing_elk_events.append(event)
+        return event
+
+    def test_retry_removed_before_processed_event_published(self):
+        """Retry matching must not read an event the consumer may own."""
+        retry = self._retry_event('0059')
+        incoming = PublishCheckDeque(self.elk)
+        self.elk._queue_incoming_elk_events = incoming
+        self.elk.elk_event_enqueue(packet(Event.EVENT_ZONE_UPDATE, '0059'))
+        self.assertEqual(incoming.outgoing_at_publish, [[]])
+        self.assertNotIn(retry, self.elk._queue_outgoing_elk_events)
+
+    def test_retry_removed_before_scanned_event_published(self):
+        """Same for events published to elk_event_scan."""
+        retry = self._retry_event('01')
+        condition = PublishCheckCondition(self.elk)
+        self.elk._incoming_condition = condition
+        self.elk.elk_event_enqueue(packet(Event.EVENT_DESCRIPTION_REPLY,
+                                          '01001Front Door      '))
+        self.assertEqual(condition.outgoing_at_publish, [[]])
+        self.assertNotIn(retry, self.elk._queue_outgoing_elk_events)
+
+    def test_no_rescan_in_progress(self):
+        """Rescan blacklisted reports are processed, not left for a scan."""
+        time.sleep(0.2)
+        self.assertFalse(self.elk._rescan_in_progress)
+        self.elk.elk_event_enqueue(packet(Event.EVENT_ZONE_STATUS_REPORT, '1'*208))
+        self.assertEqual(self.elk.ZONES[0].state, 1)
+        self.assertFalse(self.elk._incoming_by_type[Event.EVENT_ZONE_STATUS_REPORT])
+
+    def test_unmatched_retry_kept(self):
+        retry = self._retry_event('0101')
+        self.elk.elk_event_enqueue(packet(Event.EVENT_ZONE_UPDATE, '0059'))
+        self.assertIn(retry, self.elk._queue_outgoing_elk_events)
+
+    def test_processed_event_returned_to_pool(self):
+        pool = self.elk._event_pool
+        free = len(pool._free)
+        self.elk.elk_event_enqueue(packet(Event.EVENT_ZONE_UPDATE, '0059'))
+        self.assertEqual(len(pool._free), free)
+        self.assertFalse(self.elk._queue_incoming_elk_events)
+
+
+class EventPoolTest(unittest.TestCase):
+
+    def test_acquire_resets_released_event(self):
+        pool = EventPool(size=1)
+        event = pool.acquire()
+        event.parse(packet(Event.EVENT_ZONE_UPDATE, '0059'))
+        pool.release(event)
+        again = pool.acquire()
+        self.assertIs(again, event)
+        self.assertEqual(again.type, '')
+        self.assertIsNone(again._number)
+
+    def test_acquire_when_empty(self):
+        pool = EventPool(size=1)
+        first = pool.acquire()
+        second = pool.acquire()
+        self.assertIsNot(first, second)
+        pool.release(first)
+        pool.release(second)
+        self.assertEqual(len(pool._free), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+"""Tests for Event packet formatting and checksums."""
+import unittest
+
+from PyElk.Event import Event
+
+
+class ChecksumTest(unittest.TestCase):
+
+    def test_protocol_examples(self):
+        # Request examples from the Elk M1 ASCII protocol document
+        self.assertEqual(Event.checksum_calculate('06as00'), '66')
+        self.assertEqual(Event.checksum_calculate('06zs00'), '4D')
+
+    def test_bytes(self):
+        self.assertEqual(Event.checksum_calculate(b'06as00'), '66')
+
+    def test_sum_multiple_of_256(self):
+        # Two's complement of 0 is 0, formatted as two characters
+        self.assertEqual(sum(b'0Dcx010000000') % 256, 0)
+        self.assertEqual(Event.checksum_calculate('0Dcx010000000'), '00')
+
+    def test_to_string(self):
+        event = Event()
+        event.type = Event.EVENT_ARMING_STATUS
+        self.assertEqual(event.to_string(), '06as0066')
+        event = Event()
+        event.type = Event.EVENT_COUNTER_WRITE
+        event.data_str = '0100000'
+        self.assertEqual(event.to_string(), '0Dcx01000000000')
+
+    def test_parse_checksum(self):
+        event = Event()
+        event.parse('0Dcx01000000000')
+        self.assertTrue(event.checksum_check())
+        event = Event()
+        event.parse('0Dcx0100000000F')
+        self.assertFalse(event.checksum_check())
+
+
+if __name__ == '__main__':
+    unittest.main()
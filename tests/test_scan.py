@@ -0,0 +1,162 @@
+"""Tests for elk_event_scan and pipelined description scanning."""
+import threading
+import time
+import unittest
+
+from PyElk.Elk import Elk
+from PyElk.Event import Event
+
+from .common import make_elk, packet
+
+
+def description_reply(description_type, number, name=''):
+    """Return an Event.EVENT_DESCRIPTION_REPLY line."""
+    return packet(Event.EVENT_DESCRIPTION_REPLY,
+                  '%02d%03d%-16s' % (description_type, number, name))
+
+
+class ScanTest(unittest.TestCase):
+
+    def setUp(self):
+        self.elk = make_elk()
+
+    def test_scan_matches_type_and_data(self):
+        self.elk.elk_event_enqueue(description_reply(Event.DESCRIPTION_AREA_NAME, 1, 'Main'))
+        self.elk.elk_event_enqueue(description_reply(Event.DESCRIPTION_ZONE_NAME, 2, 'Hall'))
+        zone_type = '%02d' % Event.DESCRIPTION_ZONE_NAME
+        reply = self.elk.elk_event_scan(Event.EVENT_DESCRIPTION_REPLY,
+                                        data_match=zone_type, timeout=0)
+        self.assertTrue(reply.data_str.startswith(zone_type + '002'))
+        # Consumed, so a second scan doesn't see it again
+        self.assertFalse(self.elk.elk_event_scan(Event.EVENT_DESCRIPTION_REPLY,
+                                                 data_match=zone_type, timeout=0))
+        self.assertTrue(self.elk.elk_event_scan(Event.EVENT_DESCRIPTION_REPLY, timeout=0))
+
+    def test_scan_order(self):
+        for number in (1, 2, 3):
+            self.elk.elk_event_enqueue(description_reply(Event.DESCRIPTION_ZONE_NAME, number))
+        reply = self.elk.elk_event_scan(Event.EVENT_DESCRIPTION_REPLY, timeout=0, reverse=True)
+        self.assertEqual(reply.data_str[2:5], '003')
+        reply = self.elk.elk_event_scan(Event.EVENT_DESCRIPTION_REPLY, timeout=0)
+        self.assertEqual(reply.data_str[2:5], '001')
+
+    def test_scan_timeout(self):
+        start = time.time()
+        self.assertFalse(self.elk.elk_event_scan(Event.EVENT_DESCRIPTION_REPLY, timeout=0.1))
+        self.assertGreaterEqual(time.time() - start, 0.1)
+
+    def test_scan_woken_by_enqueue(self):
+        line = description_reply(Event.DESCRIPTION_ZONE_NAME, 1)
+        timer = threading.Timer(0.1, self.elk.elk_event_enqueue, (line,))
+        timer.start()
+        start = time.time()
+        reply = self.elk.elk_event_scan(Event.EVENT_DESCRIPTION_REPLY, timeout=5)
+        timer.join()
+        self.assertTrue(reply)
+        self.assertLess(time.time() - start, 2)
+
+
+class FakeDescriptionPanel(object):
+    """Answers description requests the way the Elk does.
+
+    descriptions: Dictionary of number to description.
+    drop: Request numbers to never answer.
+    stop_after: If set, stop answering once this number has been requested.
+    """
+
+    def __init__(self, elk, descriptions, drop=(), stop_after=None):
+        self._elk = elk
+        self._descriptions = descriptions
+        self._drop = drop
+        self._stop_after = stop_after
+        self._stopped = False
+        self.requested = []
+        self.answered = 0
+        self.consumed = 0
+        self.max_outstanding = 0
+
+    def respond(self, event):
+        if event.type != Event.EVENT_DESCRIPTION:
+            return []
+        description_type = int(event.data_str[0:2])
+        number = int(event.data_str[2:5])
+        self.requested.append(number)
+        self.max_outstanding = max(self.max_outstanding, len(self.requested) - self.consumed)
+        if self._stopped or (number in self._drop):
+            return []
+        if number == self._stop_after:
+            self._stopped = True
+        # The Elk replies with the next number that has a description
+        described = [desc_number for desc_number in sorted(self._descriptions)
+                     if desc_number >= number]
+        self.answered = self.answered + 1
+        if not described:
+            return [description_reply(description_type, 0)]
+        return [description_reply(description_type, described[0],
+                                  self._descriptions[described[0]])]
+
+    def scan(self, *args, **kwargs):
+        """elk_event_scan with a short timeout, counting replies consumed."""
+        kwargs['timeout'] = 0.2
+        reply = Elk.elk_event_scan(self._elk, *args, **kwargs)
+        if reply:
+            self.consumed = self.consumed + 1
+        return reply
+
+
+class ScanDescriptionsTest(unittest.TestCase):
+
+    def _scan(self, descriptions, zones=8, **kwargs):
+        self.elk = make_elk()
+        panel = FakeDescriptionPanel(self.elk, descriptions, **kwargs)
+        self.elk._connection._responder = panel.respond
+        self.elk.elk_event_scan = panel.scan
+        for zone in self.elk.ZONES[zones:]:
+            zone.included = False
+        self.elk.scan_descriptions(Event.DESCRIPTION_ZONE_NAME, self.elk.ZONES)
+        return panel
+
+    def _described(self):
+        return dict((zone.number, zone.description)
+                    for zone in self.elk.ZONES if zone.description)
+
+    def test_all_described(self):
+        names = dict((number, 'Zone %d name' % number) for number in range(1, 9))
+        panel = self._scan(names)
+        self.assertEqual(self._described(), names)
+        self.assertEqual(panel.requested, list(range(1, 9)))
+        self.assertLessEqual(panel.max_outstanding, 4)
+        self.assertFalse(self.elk._incoming_by_type[Event.EVENT_DESCRIPTION_REPLY])
+
+    def test_skips_undescribed(self):
+        names = {1 : 'Front Door', 6 : 'Garage', 8 : 'Patio'}
+        panel = self._scan(names, zones=16)
+        self.assertEqual(self._described(), names)
+        # The reply for 2 says nothing until 6, so 6 isn't requested
+        self.assertNotIn(6, panel.requested)
+        # Nothing after 8, stop once the Elk says so
+        self.assertNotIn(16, panel.requested)
+        self.assertFalse(self.elk._incoming_by_type[Event.EVENT_DESCRIPTION_REPLY])
+
+    def test_dropped_reply_in_window(self):
+        names = dict((number, 'Zone %d name' % number) for number in range(1, 9))
+        panel = self._scan(names, drop=(3,))
+        # Replies after the lost one are taken for earlier requests, some
+        # are missed but nothing is described under the wrong number
+        described = self._described()
+        self.assertNotIn(3, described)
+        for number, name in described.items():
+            self.assertEqual(name, names[number])
+        self.assertEqual(panel.requested, list(range(1, 9)))
+
+    def test_timeout_mid_window(self):
+        names = dict((number, 'Zone %d name' % number) for number in range(1, 9))
+        panel = self._scan(names, stop_after=2)
+        self.assertEqual(self._described(), {1 : names[1], 2 : names[2]})
+        # Gives up on the first timeout rather than sending anything more
+        self.assertEqual(panel.requested, [1, 2, 3, 4, 5, 6])
+        self.assertEqual(panel.answered, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""Tests for custom setting (Setting) parsing and writing."""
+import datetime
+import unittest
+
+from PyElk.Event import Event
+from PyElk.Setting import Setting
+
+from .common import make_elk, packet
+
+
+class SettingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.elk = make_elk()
+
+    def _reply(self, data_str):
+        self.elk.elk_event_enqueue(packet(Event.EVENT_VALUE_READ_REPLY, data_str))
+
+    def test_reply_one(self):
+        self._reply('0300042' + '1')
+        setting = self.elk.SETTINGS[2]
+        self.assertEqual(setting.status, 42)
+        self.assertEqual(setting.data_format, Setting.FORMAT_TIMER)
+        self.assertIsNone(self.elk.SETTINGS[0].status)
+
+    def test_reply_all(self):
+        values = ''.join('%05d0' % (value * 100) for value in range(1, 21))
+        self._reply('00' + values)
+        for node_index, setting in enumerate(self.elk.SETTINGS):
+            self.assertEqual(setting.status, (node_index + 1) * 100)
+            self.assertEqual(setting.data_format, Setting.FORMAT_NUMBER)
+
+    def test_time_of_day(self):
+        # 07:30 packed as hour in the high byte, minute in the low byte
+        self._reply('01%05d2' % ((7 << 8) | 30))
+        setting = self.elk.SETTINGS[0]
+        self.assertEqual(setting.status, '07:30')
+        self.assertEqual(setting.data_format_pretty, 'Time of Day')
+
+    def test_set_time_of_day(self):
+        self._reply('01%05d2' % 0)
+        setting = self.elk.SETTINGS[0]
+        setting.set_value('18:05')
+        setting.set_value(datetime.time(6, 45))
+        sent = self.elk._connection.sent
+        self.assertEqual(sent[-2], packet(Event.EVENT_VALUE_WRITE, '01%05d' % ((18 << 8) | 5)))
+        self.assertEqual(sent[-1], packet(Event.EVENT_VALUE_WRITE, '01%05d' % ((6 << 8) | 45)))
+
+    def test_set_number(self):
+        self._reply('0200000' + '0')
+        self.elk.SETTINGS[1].set_value(1234)
+        self.assertEqual(self.elk._connection.sent[-1],
+                         packet(Event.EVENT_VALUE_WRITE, '0201234'))
+
+
+if __name__ == '__main__':
+    unittest.main()